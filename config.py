@@ -1,4 +1,5 @@
 # config.py
+import multiprocessing
 import os
 import random
 
@@ -15,12 +16,48 @@ MAX_DELAY = 0.8        # Reduced
 RETRY_ATTEMPTS = 1
 BOSS_DELAY = 0.2       # Reduced between batches
 MAX_PAGES = 18
+MAX_PENDING = WORKERS        # Bosses submitted to the pool at once (backpressure; keeps priority order)
+RUN_DEADLINE_MINUTES = None  # Stop cleanly after this many minutes (or: python main.py --deadline 10)
+
+# KC ESTIMATION SETTINGS (sample a few pages per boss instead of all; or: python main.py --estimate)
+ESTIMATE_MODE = False
+ESTIMATE_STRATA = 3          # Pages sampled between the first and last page
+ESTIMATE_MAX_ERROR = 0.05    # Full crawl when the KC interval is wider than +/-5%
 
 # NEW OPTIMIZATION SETTINGS
 ENABLE_SESSION_REUSE = True  # Reuse HTTP sessions
 SESSION_TIMEOUT = 300        # Recreate session every 5 minutes
 USE_CONNECTION_POOL = True
 
-print(f"⚙️ Optimized config loaded:")
-print(f"  - WORKERS: {WORKERS}")
-print(f"  - Delays: {MIN_DELAY}-{MAX_DELAY}s")
\ No newline at end of file
+# PARSE PIPELINE SETTINGS
+PARSE_WORKERS = 0            # Parse worker processes; 0 = parse on the fetching thread
+PARSE_QUEUE_SIZE = WORKERS    # Pages parsing at once; each fetcher waits for its own page, so only < WORKERS throttles
+
+# RECORD / REPLAY SETTINGS
+ARCHIVE_MODE = "off"         # "off", "record" (archive every response) or "replay" (offline reprocess)
+ARCHIVE_FILE = os.path.join(OUTPUT_FOLDER, "response_archive.sqlite3")
+REPLAY_RUN_ID = None         # Run to replay; None = most recent recorded run
+
+# PLAYER INDEX (python main.py --find "player name")
+PLAYER_INDEX_FILE = os.path.join(OUTPUT_FOLDER, "player_index.sqlite3")
+
+# RESULTS API (python main.py --serve alongside runs, or --serve-only for existing results)
+RESULTS_DB_FILE = os.path.join(OUTPUT_FOLDER, "results_history.sqlite3")
+API_HOST = "127.0.0.1"       # Local only
+API_PORT = 8765
+
+# LOGGING SETTINGS
+LOG_LEVEL = "INFO"           # "DEBUG" adds per-page hot-path logs; "WARNING" silences routine progress
+LOG_CONSOLE_LEVEL = "INFO"
+LOG_JSON_FILE = os.path.join(OUTPUT_FOLDER, "scraper_log.jsonl")  # JSON lines log; None to disable
+
+# PROFILING SETTINGS (used with: python main.py --profile [--profile-memory] [--no-sampling])
+PROFILE_TOP_N = 25               # Hotspots listed in hotspots.txt
+PROFILE_SAMPLE_INTERVAL = 0.005  # Stack sampling interval in seconds
+
+# Spawned parse workers import config too; only the launching process reports it
+if multiprocessing.current_process().name == "MainProcess":
+    print(f"⚙️ Optimized config loaded:")
+    print(f"  - WORKERS: {WORKERS}")
+    print(f"  - Delays: {MIN_DELAY}-{MAX_DELAY}s")
+    print(f"  - Archive mode: {ARCHIVE_MODE}")
\ No newline at end of file
@@ -1,5 +1,8 @@
 # csv_loader.py
 import pandas as pd
+from structured_log import get_logger
+
+logger = get_logger("csv_loader")
 
 def load_boss_urls(csv_path):
     """Load boss names and URLs from CSV file"""
@@ -7,5 +10,5 @@ def load_boss_urls(csv_path):
         df = pd.read_csv(csv_path)
         return dict(zip(df['Boss_Name'], df['URL']))
     except Exception as e:
-        print(f"❌ CSV Error: {e}")
+        logger.error(f"❌ CSV Error: {e}")
         return {}
\ No newline at end of file
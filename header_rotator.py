@@ -2,12 +2,14 @@
 import pandas as pd
 import itertools
 import os
-import traceback
+from structured_log import get_logger
+
+logger = get_logger("headers")
 
 class HeaderRotator:
     def __init__(self, headers_file):
-        print(f"🔄 Initializing HeaderRotator with file: {headers_file}")
-        print(f"📂 File exists: {os.path.exists(headers_file)}")
+        logger.info(f"🔄 Initializing HeaderRotator with file: {headers_file}")
+        logger.info(f"📂 File exists: {os.path.exists(headers_file)}")
         
         self.headers_file = headers_file
         self.headers_list = []
@@ -17,16 +19,15 @@ class HeaderRotator:
         try:
             self.headers_list = self.load_headers(headers_file)
             if self.headers_list:
-                print(f"✅ Successfully loaded {len(self.headers_list)} headers")
+                logger.info(f"✅ Successfully loaded {len(self.headers_list)} headers")
                 self.header_cycle = itertools.cycle(self.headers_list)
             else:
-                print("⚠️ No headers loaded, creating default")
+                logger.warning("⚠️ No headers loaded, creating default")
                 self.headers_list = [self.create_default_header()]
                 self.header_cycle = itertools.cycle(self.headers_list)
                 
         except Exception as e:
-            print(f"❌ Critical error in HeaderRotator.__init__: {e}")
-            traceback.print_exc()
+            logger.exception(f"❌ Critical error in HeaderRotator.__init__: {e}")
             # Create a default header as fallback
             self.headers_list = [self.create_default_header()]
             self.header_cycle = itertools.cycle(self.headers_list)
@@ -37,7 +38,7 @@ class HeaderRotator:
         
         try:
             if not os.path.exists(headers_file):
-                print(f"❌ Headers file not found: {headers_file}")
+                logger.error(f"❌ Headers file not found: {headers_file}")
                 return headers
                 
             df = pd.read_csv(headers_file)
@@ -57,14 +58,14 @@ class HeaderRotator:
                     headers.append(header_dict)
                         
                 except Exception as e:
-                    print(f"⚠️ Error processing header row: {e}")
+                    logger.warning(f"⚠️ Error processing header row: {e}")
                     continue
             
-            print(f"✅ Processed {len(headers)} header configurations")
+            logger.info(f"✅ Processed {len(headers)} header configurations")
             return headers
             
         except Exception as e:
-            print(f"❌ Error loading headers: {e}")
+            logger.error(f"❌ Error loading headers: {e}")
             return headers
     
     def safe_encode(self, text):
@@ -82,7 +83,7 @@ class HeaderRotator:
     
     def create_default_header(self):
         """Create a default header if CSV loading fails"""
-        print("🛠️ Creating default header")
+        logger.info("🛠️ Creating default header")
         return {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'From': 'research@example.com',
@@ -96,12 +97,12 @@ class HeaderRotator:
     def get_headers_for_worker(self, worker_id):
         """Get headers for a specific worker, cycling through the list"""
         if not self.header_cycle:
-            print(f"⚠️ No header cycle for worker {worker_id}, creating default")
+            logger.warning(f"⚠️ No header cycle for worker {worker_id}, creating default", extra={'worker': worker_id})
             return self.create_default_header()
             
         if worker_id not in self.worker_headers:
             self.worker_headers[worker_id] = next(self.header_cycle)
-            print(f"👷 Assigned header to Worker {worker_id}")
+            logger.debug(f"👷 Assigned header to Worker {worker_id}", extra={'worker': worker_id})
         return self.worker_headers[worker_id]
     
     def rotate_worker_headers(self, worker_id):
@@ -111,7 +112,7 @@ class HeaderRotator:
             
         new_headers = next(self.header_cycle)
         self.worker_headers[worker_id] = new_headers
-        print(f"🔄 Rotated headers for Worker {worker_id}")
+        logger.debug(f"🔄 Rotated headers for Worker {worker_id}", extra={'worker': worker_id})
         return new_headers
     
     def get_next_headers(self):
@@ -127,13 +128,12 @@ class HeaderRotator:
 # Create a global instance
 try:
     from config import HEADERS_FILE
-    print(f"🔧 Creating global_header_rotator with HEADERS_FILE: {HEADERS_FILE}")
+    logger.info(f"🔧 Creating global_header_rotator with HEADERS_FILE: {HEADERS_FILE}")
     global_header_rotator = HeaderRotator(HEADERS_FILE)
-    print(f"✅ Global header rotator created successfully")
+    logger.info(f"✅ Global header rotator created successfully")
 except Exception as e:
-    print(f"❌ Failed to create global_header_rotator: {e}")
-    traceback.print_exc()
+    logger.exception(f"❌ Failed to create global_header_rotator: {e}")
     # Create with default path as fallback
     default_path = r"C:\Users\nikki\AppData\Local\Temp\headers.csv"
-    print(f"🔄 Trying default path: {default_path}")
+    logger.info(f"🔄 Trying default path: {default_path}")
     global_header_rotator = HeaderRotator(default_path)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# kc_estimator.py
+import math
+
+ROWS_PER_PAGE = 25
+
+def choose_sample_pages(last_page, strata=3):
+    """Pages to fetch for an estimate: first, last and `strata` evenly spaced pages between"""
+    if last_page <= strata + 2:
+        return list(range(1, last_page + 1))
+    step = (last_page - 1) / (strata + 1)
+    interior = {1 + round(step * i) for i in range(1, strata + 1)}
+    return sorted({1, last_page} | interior)
+
+def interpolate_score(rank, left, right):
+    """Score at `rank` between two known (rank, score) points.
+
+    KC falls off roughly as a power of rank, so interpolate in log-log space;
+    fall back to linear when a score is zero. Either way the result stays
+    between the two neighbours, as the monotone curve requires."""
+    (left_rank, left_score), (right_rank, right_score) = left, right
+    if left_score > 0 and right_score > 0:
+        t = (math.log(rank) - math.log(left_rank)) / (math.log(right_rank) - math.log(left_rank))
+        return math.exp(math.log(left_score) + t * (math.log(right_score) - math.log(left_score)))
+    return left_score + (right_score - left_score) * (rank - left_rank) / (right_rank - left_rank)
+
+def _interpolated_sum(ranks, left, right):
+    return sum(interpolate_score(rank, left, right) for rank in ranks)
+
+def estimate_totals(sampled_rows, max_pages, rows_per_page=ROWS_PER_PAGE, table_ends=False):
+    """Estimate total KC and player count from a subset of pages.
+
+    sampled_rows maps page number -> RowBatch as returned by scrape_page,
+    and must include page 1. table_ends=True says the last sampled page is
+    known to be the table's last, even if it is full (the page after it was
+    probed and had no new ranks). Returns a dict with:
+    - total_kc / players: the estimate
+    - kc_low / kc_high: hard bounds. Scores are monotone in rank, so an
+      unfetched rank scores between its nearest fetched neighbours.
+    - ci_low / ci_high: an approximate interval. Each interior sampled page is
+      re-predicted from its sampled neighbours (leave-one-out), and the RMS
+      relative error is applied to the interpolated KC. The interval is
+      clipped to the hard bounds.
+    """
+    pages = sorted(sampled_rows)
+    points = {page: sorted(zip(sampled_rows[page].ranks, sampled_rows[page].scores)) for page in pages}
+    
+    known_kc = sum(score for page in pages for _, score in points[page])
+    interpolated_kc = 0.0
+    kc_low = known_kc
+    kc_high = known_kc
+    
+    # Fill the gaps between consecutive sampled pages
+    for left_page, right_page in zip(pages, pages[1:]):
+        left, right = points[left_page][-1], points[right_page][0]
+        missing = range(left[0] + 1, right[0])
+        if missing:
+            interpolated_kc += _interpolated_sum(missing, left, right)
+            kc_low += len(missing) * right[1]
+            kc_high += len(missing) * left[1]
+    
+    # Leave-one-out error of the interpolation on pages we actually have
+    errors = []
+    for left_page, page, right_page in zip(pages, pages[1:], pages[2:]):
+        actual = sum(score for _, score in points[page])
+        if actual:
+            ranks = [rank for rank, _ in points[page]]
+            predicted = _interpolated_sum(ranks, points[left_page][-1], points[right_page][0])
+            errors.append((predicted - actual) / actual)
+    
+    total_kc = known_kc + interpolated_kc
+    if errors:
+        half_width = math.sqrt(sum(e * e for e in errors) / len(errors)) * interpolated_kc
+        ci_low = max(kc_low, total_kc - half_width)
+        ci_high = min(kc_high, total_kc + half_width)
+    else:
+        ci_low, ci_high = kc_low, kc_high
+    
+    # Where does the table end?
+    last_rank, last_score = points[pages[-1]][-1]
+    players = last_rank
+    players_exact = table_ends or len(points[pages[-1]]) < rows_per_page or pages[-1] >= max_pages
+    players_high = players
+    if not players_exact:
+        # The table runs past the last sampled page; anyone there scores at most the last seen score
+        players_high = max_pages * rows_per_page
+        kc_high += (players_high - players) * last_score
+        ci_high = kc_high
+    
+    return {
+        'total_kc': int(round(total_kc)),
+        'kc_low': kc_low,
+        'kc_high': kc_high,
+        'ci_low': int(math.floor(ci_low)),
+        'ci_high': int(math.ceil(ci_high)),
+        'players': players,
+        'players_high': players_high,
+        'players_exact': players_exact,
+        'sampled_pages': pages,
+    }
+
+def relative_error(estimate):
+    """Half-width of the approximate interval relative to the estimate"""
+    if not estimate['total_kc']:
+        return math.inf
+    return (estimate['ci_high'] - estimate['ci_low']) / 2 / estimate['total_kc']
+
+def needs_full_crawl(estimate, max_relative_error):
+    """True when the table end is unknown or the interval is too wide for trend detection"""
+    return not estimate['players_exact'] or relative_error(estimate) > max_relative_error
+
+def _self_check():
+    """Estimate a synthetic power-law table against its known true totals"""
+    from types import SimpleNamespace
+    
+    def table(players, exponent=0.8, top_score=50000):
+        return [max(5, int(top_score * rank ** -exponent)) for rank in range(1, players + 1)]
+    
+    def sample(scores, pages):
+        sampled = {}
+        for page in pages:
+            ranks = range((page - 1) * ROWS_PER_PAGE + 1, min(page * ROWS_PER_PAGE, len(scores)) + 1)
+            sampled[page] = SimpleNamespace(ranks=list(ranks), scores=[scores[rank - 1] for rank in ranks])
+        return sampled
+    
+    for players, table_ends in ((1013, False), (1000, True)):
+        scores = table(players)
+        last_page = -(-players // ROWS_PER_PAGE)
+        estimate = estimate_totals(sample(scores, choose_sample_pages(last_page, 3)), 1000, table_ends=table_ends)
+        true_kc = sum(scores)
+        assert estimate['players_exact'] and estimate['players'] == players, estimate
+        assert estimate['kc_low'] <= true_kc <= estimate['kc_high'], (true_kc, estimate)
+        assert abs(estimate['total_kc'] - true_kc) / true_kc < 0.02, (true_kc, estimate)
+        assert estimate['ci_low'] <= true_kc <= estimate['ci_high'], (true_kc, estimate)
+        print(f"{players} players: estimated {estimate['total_kc']:,} vs true {true_kc:,} "
+              f"(±{relative_error(estimate):.1%}, bounds {estimate['kc_low']:,}-{estimate['kc_high']:,})")
+    
+    # A full last page without the probe could hide more players
+    assert not estimate_totals(sample(table(1000), [1, 20, 40]), 1000)['players_exact']
+    print("✅ kc_estimator self-check passed")
+
+if __name__ == "__main__":
+    _self_check()
\ No newline at end of file
@@ -1,4 +1,5 @@
 # main.py
+import logging
 import pandas as pd
 import time
 from datetime import datetime, timedelta
@@ -7,67 +8,135 @@ import traceback
 import sys
 import random  # <-- ADD THIS LINE!
 from threading import Lock
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-print("=" * 60)
-print("🚀 OSRS HiScores Web Scraper - Starting up")
-print("=" * 60)
+# Spawned parse workers re-import this file as __mp_main__; startup output stays in the launched script
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🚀 OSRS HiScores Web Scraper - Starting up")
+    print("=" * 60)
 
-# Import with error handling
-try:
-    from config import CSV_FILE, OUTPUT_FOLDER, WORKERS, BOSS_DELAY, MAX_PAGES
-    print(f"✅ Config imported")
-except Exception as e:
-    print(f"❌ Failed to import config: {e}")
+def import_failed(module_name, e):
+    """Report a failed required import; spawned parse workers just re-raise"""
+    if __name__ != "__main__":
+        raise e
+    print(f"❌ Failed to import {module_name}: {e}")
     traceback.print_exc()
     input("\nPress Enter to exit...")
     exit()
 
+# Import with error handling
+try:
+    from config import CSV_FILE, OUTPUT_FOLDER, WORKERS, BOSS_DELAY, MAX_PAGES, ARCHIVE_MODE, REPLAY_RUN_ID
+    from config import PROFILE_TOP_N, PROFILE_SAMPLE_INTERVAL, MAX_PENDING, RUN_DEADLINE_MINUTES
+    from config import ESTIMATE_MODE, ESTIMATE_STRATA, ESTIMATE_MAX_ERROR
+    from config import API_HOST, API_PORT
+except Exception as e:
+    import_failed("config", e)
+
 try:
     from csv_loader import load_boss_urls
-    print(f"✅ CSV loader imported")
 except Exception as e:
-    print(f"❌ Failed to import csv_loader: {e}")
-    traceback.print_exc()
-    input("\nPress Enter to exit...")
-    exit()
+    import_failed("csv_loader", e)
 
 try:
-    from scraper import scrape_page
-    print(f"✅ Scraper imported")
+    from structured_log import get_logger, StatusDisplay, clear_status, flush_logs
+    logger = get_logger("main")
 except Exception as e:
-    print(f"❌ Failed to import scraper: {e}")
-    traceback.print_exc()
-    input("\nPress Enter to exit...")
-    exit()
+    import_failed("structured_log", e)
+
+try:
+    from profiler import RunProfiler, profiled
+except Exception as e:
+    import_failed("profiler", e)
+
+try:
+    from scraper import scrape_page, parse_page, wait_or_stop
+except Exception as e:
+    import_failed("scraper", e)
+
+try:
+    from parallel_manager import ParallelManager
+except Exception as e:
+    import_failed("parallel manager", e)
+
+try:
+    from kc_estimator import choose_sample_pages, estimate_totals, needs_full_crawl, relative_error
+except Exception as e:
+    import_failed("kc_estimator", e)
+
+try:
+    from row_batch import RowBatch
+except Exception as e:
+    import_failed("row_batch", e)
+
+try:
+    from parse_pool import global_parse_pool as parse_pool
+except Exception as e:
+    import_failed("parse pool", e)
 
 try:
     from header_rotator import global_header_rotator as header_rotator
-    print(f"✅ Header rotator imported")
 except Exception as e:
-    print(f"❌ Failed to import header rotator: {e}")
-    traceback.print_exc()
-    input("\nPress Enter to exit...")
-    exit()
+    import_failed("header rotator", e)
+
+# Optional modules: the run goes on without them (callers check for None)
+optional_import_errors = {}
+try:
+    from response_archive import global_response_archive as response_archive
+except Exception as e:
+    optional_import_errors['response archive'] = e
+    response_archive = None
+try:
+    from player_index import global_player_index as player_index
+except Exception as e:
+    optional_import_errors['player index'] = e
+    player_index = None
+try:
+    from results_store import global_results_store as results_store
+except Exception as e:
+    optional_import_errors['results store'] = e
+    results_store = None
+try:
+    from results_api import ResultsServer
+except Exception as e:
+    optional_import_errors['results API'] = e
+    ResultsServer = None
 try:
     from rate_limiter import global_rate_limiter as rate_limiter
-    print(f"✅ Rate limiter imported")
 except Exception as e:
-    print(f"❌ Failed to import rate limiter: {e}")
+    optional_import_errors['rate limiter'] = e
     # Create a simple fallback
     class SimpleRateLimiter:
         def wait_if_needed(self):
             pass  # No rate limiting if import fails
     
     rate_limiter = SimpleRateLimiter()
-    print(f"🔄 Using simple rate limiter fallback")
 
-print("\n" + "=" * 60)
-print("📊 System Diagnostics:")
-print(f"  - CSV file exists: {os.path.exists(CSV_FILE)}")
-print(f"  - Output folder exists: {os.path.exists(OUTPUT_FOLDER)}")
-print(f"  - Available headers: {header_rotator.get_headers_count() if hasattr(header_rotator, 'get_headers_count') else 'N/A'}")
-print("=" * 60 + "\n")
+def print_startup_diagnostics():
+    """Import report and diagnostics - only for the launched script, not parse workers"""
+    print(f"✅ Config imported")
+    print(f"✅ CSV loader imported")
+    print(f"✅ Logging configured")
+    print(f"✅ Profiler imported")
+    print(f"✅ Scraper imported")
+    print(f"✅ Parallel manager imported")
+    print(f"✅ KC estimator imported")
+    print(f"✅ Parse pool imported")
+    print(f"✅ Header rotator imported")
+    for module_name in ('response archive', 'player index', 'results store', 'results API', 'rate limiter'):
+        if module_name in optional_import_errors:
+            print(f"❌ Failed to import {module_name}: {optional_import_errors[module_name]}")
+        else:
+            print(f"✅ {module_name[0].upper() + module_name[1:]} imported")
+    if 'rate limiter' in optional_import_errors:
+        print(f"🔄 Using simple rate limiter fallback")
+    
+    print("\n" + "=" * 60)
+    print("📊 System Diagnostics:")
+    print(f"  - CSV file exists: {os.path.exists(CSV_FILE)}")
+    print(f"  - Output folder exists: {os.path.exists(OUTPUT_FOLDER)}")
+    print(f"  - Available headers: {header_rotator.get_headers_count() if hasattr(header_rotator, 'get_headers_count') else 'N/A'}")
+    print("=" * 60 + "\n")
 
 class StatusTracker:
     def __init__(self, total_bosses, max_pages_per_boss):
@@ -126,17 +195,12 @@ class StatusTracker:
             }
 
 def clear_status_line():
-    """Clear the entire line more thoroughly"""
-    sys.stdout.write('\r\033[K')  # \033[K clears from cursor to end of line
-    sys.stdout.flush()
+    """Write out pending log lines and remove the status bar"""
+    flush_logs()
+    clear_status()
 
-def print_status(tracker):
-    """Print the status bar and progress information"""
-    progress = tracker.get_progress()
-    
-    # Clear line more thoroughly
-    clear_status_line()
-    
+def render_status(progress):
+    """Build the status bar line from a tracker progress snapshot"""
     # Progress bar
     bar_length = 40
     filled_length = int(bar_length * progress['boss_progress'] / 100)
@@ -148,31 +212,46 @@ def print_status(tracker):
     status_line += f"⏱️ ETA: {progress['eta']} "
     status_line += f"⏳ Elapsed: {progress['elapsed']}"
     
-    sys.stdout.write(status_line)
-    sys.stdout.flush()
+    return status_line
 
-def scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages=MAX_PAGES):
-    """Worker function to scrape ALL pages for a boss - KEEP TRYING UNTIL SUCCESS"""
-    all_players_data = []
+def scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages=MAX_PAGES, should_stop=None, prefetched=None):
+    """Worker function to scrape ALL pages for a boss - KEEP TRYING UNTIL SUCCESS
+
+    Pages are fetched in rank order, so when should_stop() turns true the
+    highest-KC pages are already in. Pages in `prefetched` (page -> rows) are
+    reused instead of fetched again. Returns (boss_name, rows, partial)."""
+    all_players_data = RowBatch()
+    partial = False
     
     for page in range(1, max_pages + 1):
+        if should_stop and should_stop():
+            partial = True
+            logger.warning(f"⏹️ {boss_name}: Run stopped before page {page}, keeping {len(all_players_data)} players",
+                           extra={'boss': boss_name, 'page': page, 'players': len(all_players_data)})
+            break
+        
         tracker.update_boss_status(boss_name, page, "scraping")
         
         # KEEP TRYING THIS PAGE UNTIL WE GET DATA
         page_attempts = 0
         while True:
-            rows = scrape_page(boss_name, url, page, worker_id)
+            if prefetched and page in prefetched:
+                rows = prefetched[page]
+            else:
+                rows = scrape_page(boss_name, url, page, worker_id, should_stop)
             
             if rows and len(rows) > 0:
                 # Check if this page has fewer than 25 players
                 player_count = len(rows)
                 all_players_data.extend(rows)
-                tracker.mark_page_complete()
+                if not (prefetched and page in prefetched):
+                    tracker.mark_page_complete()  # Prefetched pages were counted when sampled
                 tracker.update_boss_status(boss_name, page, f"✓ {player_count} players")
                 
                 # 🔥 NEW FUNCTIONALITY: If page has fewer than 25 players, skip remaining pages
                 if player_count < 25:
-                    print(f"   Page {page}: Only {player_count}/25 players found. Skipping remaining pages for {boss_name}...")
+                    logger.info(f"   Page {page}: Only {player_count}/25 players found. Skipping remaining pages for {boss_name}...",
+                                extra={'boss': boss_name, 'page': page, 'players': player_count})
                     
                     # Mark remaining pages as completed for progress tracking
                     remaining_pages = max_pages - page
@@ -182,11 +261,20 @@ def scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages=MAX_PAGES):
                     # Break out of the page loop entirely
                     break
                 
-                #print(f"   Page {page}: {player_count} players")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"   Page {page}: {player_count} players",
+                                 extra={'boss': boss_name, 'page': page, 'players': player_count})
                 break  # Success! Move to next page
+            elif should_stop and should_stop():
+                # Abandon this page - it is not collected, so the boss is partial
+                partial = True
+                logger.warning(f"⏹️ {boss_name}: Run stopped during page {page}, keeping {len(all_players_data)} players",
+                               extra={'boss': boss_name, 'page': page, 'players': len(all_players_data)})
+                break
             else:
                 page_attempts += 1
-                print(f"   Page {page}: FAILED attempt {page_attempts}, retrying in 30s...")
+                logger.warning(f"   Page {page}: FAILED attempt {page_attempts}, retrying...",
+                               extra={'boss': boss_name, 'page': page, 'attempt': page_attempts})
                 
                 # Wait before retrying same page
                 time.sleep(random.uniform(0.5, 2))
@@ -197,81 +285,370 @@ def scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages=MAX_PAGES):
                 except:
                     pass
         
+        if partial:
+            break
+        
         # 🔥 NEW: Check if we broke out due to <25 players
         if rows and len(rows) < 25:
             break  # Exit the for loop entirely, skip remaining pages
         
         # Small pause between successful pages (only if we have 25 players)
-        if page < max_pages and (not rows or len(rows) == 25):
+        next_prefetched = prefetched and page + 1 in prefetched
+        if page < max_pages and (not rows or len(rows) == 25) and not next_prefetched:
             pause = random.uniform(3, 7)
-            #print(f"⏸️  Pausing {pause:.1f}s before page {page + 1}...")
-            time.sleep(pause)
+            wait_or_stop(pause, should_stop)
     
     tracker.mark_boss_complete(boss_name)
     
     # Report final results
     total_players = len(all_players_data)
-    print(f"✅ {boss_name}: COMPLETE - {total_players} players collected")
+    if partial:
+        logger.info(f"⏹️ {boss_name}: PARTIAL - {total_players} players collected",
+                    extra={'boss': boss_name, 'players': total_players, 'partial': True})
+    else:
+        logger.info(f"✅ {boss_name}: COMPLETE - {total_players} players collected",
+                    extra={'boss': boss_name, 'players': total_players})
     
-    return boss_name, all_players_data
+    return boss_name, all_players_data, partial
 
-def process_and_save_boss_data(boss_name, boss_data, tracker):
-    """Process and save data for a single boss"""
-    if not boss_data:
-        return False
+def estimate_boss_worker(boss_name, url, worker_id, tracker, max_pages=MAX_PAGES, should_stop=None):
+    """Worker function to estimate a boss's totals from a few sampled pages
+
+    Falls back to a full crawl (reusing the sampled pages) when there is no
+    previous player count to place the last page, or when the estimate is too
+    uncertain. Returns (boss_name, rows, partial, estimate); estimate is None
+    when the boss was fully crawled."""
+    previous = load_previous_totals(boss_name)
+    if previous is None:
+        logger.info(f"🔎 {boss_name}: No previous totals, doing a full crawl", extra={'boss': boss_name})
+        return scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages, should_stop) + (None,)
+    
+    # The table rarely shrinks, so last run's player count tells us which page is last
+    last_page = max(1, min(max_pages, -(-int(previous['Players']) // 25)))
+    sample_pages = choose_sample_pages(last_page, ESTIMATE_STRATA)
+    
+    sampled = {}
+    for page in sample_pages:
+        if should_stop and should_stop():
+            break
+        tracker.update_boss_status(boss_name, page, "sampling")
+        rows = scrape_page(boss_name, url, page, worker_id, should_stop)
+        if not rows:
+            break
+        sampled[page] = rows
+        tracker.mark_page_complete()
+        if len(rows) < 25:
+            break  # Table ends here
+        wait_or_stop(random.uniform(3, 7), should_stop)
+    
+    if 1 not in sampled:
+        tracker.mark_boss_complete(boss_name)
+        return boss_name, RowBatch(), True, None
+    
+    # A full last page leaves the table end unknown (e.g. exactly 50 players last run):
+    # probe the next page, accepting an empty table there as the end
+    table_ends = False
+    if max(sampled) == last_page and len(sampled[last_page]) == 25 and last_page < max_pages \
+            and not (should_stop and should_stop()):
+        tracker.update_boss_status(boss_name, last_page + 1, "probing")
+        rows = scrape_page(boss_name, url, last_page + 1, worker_id, should_stop, allow_empty=True)
+        if rows and min(rows.ranks) > max(sampled[last_page].ranks):
+            sampled[last_page + 1] = rows  # The table grew onto the next page
+            tracker.mark_page_complete()
+        elif isinstance(rows, RowBatch):
+            table_ends = True  # No new ranks past the last page ([] means the probe failed or was stopped)
+    
+    estimate = estimate_totals(sampled, max_pages, table_ends=table_ends)
+    pages = sorted(sampled)
+    if estimate['players_exact'] and pages == list(range(1, pages[-1] + 1)):
+        # Every page up to the table end was sampled (small tables): that is a full crawl, save it as one
+        all_players_data = RowBatch()
+        for page in pages:
+            all_players_data.extend(sampled[page])
+        for _ in range(max_pages - len(sampled)):
+            tracker.mark_page_complete()
+        tracker.mark_boss_complete(boss_name)
+        logger.info(f"✅ {boss_name}: COMPLETE - {len(all_players_data)} players collected (all pages sampled)",
+                    extra={'boss': boss_name, 'players': len(all_players_data)})
+        return boss_name, all_players_data, False, None
     
+    if needs_full_crawl(estimate, ESTIMATE_MAX_ERROR):
+        logger.info(f"🔎 {boss_name}: Estimate too uncertain (±{relative_error(estimate):.1%}, "
+                    f"table end {'known' if estimate['players_exact'] else 'unknown'}), doing a full crawl",
+                    extra={'boss': boss_name, 'relative_error': relative_error(estimate)})
+        return scrape_boss_worker(boss_name, url, worker_id, tracker, max_pages, should_stop, sampled) + (None,)
+    
+    # Skipped pages count as done for progress tracking
+    for _ in range(max_pages - len(sampled)):
+        tracker.mark_page_complete()
+    tracker.mark_boss_complete(boss_name)
+    
+    return boss_name, None, False, estimate
+
+def load_previous_totals(boss_name):
+    """Last saved full row for a boss as a dict, or None if it has never been saved in full"""
+    csv_path = os.path.join(OUTPUT_FOLDER, f"{boss_name.replace(' ', '_')}.csv")
+    try:
+        previous = pd.read_csv(csv_path).iloc[0].to_dict()
+    except Exception:
+        return None
+    # Older runs wrote deadline-cut totals here; they would understate the boss
+    if str(previous.get('Partial', False)).strip().lower() == 'true':
+        return None
+    return previous
+
+def boss_priority(boss_name):
+    """Scheduling key for a boss: most active first, never-scraped bosses before all others"""
+    previous = load_previous_totals(boss_name)
+    try:
+        return -int(previous['Total KC'])
+    except Exception:
+        return float('-inf')
+
+def save_boss_estimate(boss_name, estimate, tracker, output_folder=OUTPUT_FOLDER, timestamp=None, publish=True):
+    """Save an estimated total in the same CSV layout, plus its interval
+
+    output_folder, timestamp and publish work as in process_and_save_boss_data."""
     try:
         tracker.update_boss_status(boss_name, 0, "saving")
+        timestamp = timestamp or time.time()
+        
+        final_df = pd.DataFrame({
+            'Boss Name': [boss_name],
+            'Total KC': [estimate['total_kc']],
+            'Players': [estimate['players']],
+            'Last Updated': [datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")],
+            'Partial': [False],
+            'Estimated': [True],
+            'KC Low': [estimate['ci_low']],
+            'KC High': [estimate['ci_high']],
+            'Sampled Pages': [' '.join(str(page) for page in estimate['sampled_pages'])]
+        })
         
-        # Convert to DataFrame
-        df = pd.DataFrame(boss_data, columns=['Rank', 'Name', 'Score'])
+        csv_filename = f"{boss_name.replace(' ', '_')}.csv"
+        final_df.to_csv(os.path.join(output_folder, csv_filename), index=False)
+        if publish:
+            record_result(boss_name, estimate['total_kc'], estimate['players'], estimated=True, timestamp=timestamp)
         
-        # Clean and format data
-        # Convert score (KC) to numeric (remove commas)
-        df['Score'] = df['Score'].astype(str).str.replace(',', '').astype(int)
+        logger.info(f"🔎 {boss_name}: ~{estimate['players']} players, ~{estimate['total_kc']:,} total KC "
+                    f"({estimate['ci_low']:,}-{estimate['ci_high']:,})",
+                    extra={'boss': boss_name, 'players': estimate['players'], 'total_kc': estimate['total_kc'],
+                           'kc_low': estimate['ci_low'], 'kc_high': estimate['ci_high'], 'estimated': True})
+        return True
         
+    except Exception as e:
+        logger.error(f"❌ Error saving estimate for {boss_name}: {e}", extra={'boss': boss_name})
+        return False
+
+def record_result(boss_name, total_kc, players, partial=False, estimated=False, timestamp=None):
+    """Append a saved total to the results history served by the results API"""
+    if results_store is None:
+        return
+    try:
+        results_store.record(boss_name, total_kc, players, timestamp or time.time(), partial, estimated)
+    except Exception as e:
+        logger.warning(f"⚠️ Results history update failed for {boss_name}: {e}", extra={'boss': boss_name})
+
+@profiled
+def process_and_save_boss_data(boss_name, boss_data, tracker, partial=False, output_folder=OUTPUT_FOLDER,
+                               timestamp=None, publish=True):
+    """Process and save data for a single boss
+
+    boss_data is the boss's accumulated RowBatch; partial marks totals cut short by the run deadline or a cancel.
+    A partial total goes to the partial/ subfolder so the boss's last full CSV (read by the workbook and by
+    scheduling) is kept. timestamp (epoch seconds) is when the data was fetched, now by default. publish=False writes only the
+    CSV, leaving the results history and player index alone (used by replay)."""
+    if not boss_data:
+        return False
+    
+    try:
+        tracker.update_boss_status(boss_name, 0, "saving")
+        
+        # Scores are already integers in the batch's score array
         # Calculate total KC (sum of all players' KC)
-        total_kc = df['Score'].sum()
+        total_kc = boss_data.total_score()
         
         # Get total number of players
-        total_players = len(df)
+        total_players = len(boss_data)
         
-        # Get current timestamp for Last Updated
-        last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Timestamp for Last Updated - when the pages were fetched
+        timestamp = timestamp or time.time()
+        last_updated = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
         
         # Create the final DataFrame in the correct format
         final_df = pd.DataFrame({
             'Boss Name': [boss_name],
             'Total KC': [total_kc],
             'Players': [total_players],
-            'Last Updated': [last_updated]
+            'Last Updated': [last_updated],
+            'Partial': [partial]
         })
         
         # Save to CSV
         csv_filename = f"{boss_name.replace(' ', '_')}.csv"  # Replace spaces with underscores
-        csv_path = os.path.join(OUTPUT_FOLDER, csv_filename)
-        final_df.to_csv(csv_path, index=False)
+        partial_path = os.path.join(output_folder, "partial", csv_filename)
+        if partial:
+            os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+            final_df.to_csv(partial_path, index=False)
+        else:
+            final_df.to_csv(os.path.join(output_folder, csv_filename), index=False)
+            if os.path.exists(partial_path):
+                os.remove(partial_path)  # Superseded by this full total
         
-        # Clear status line to print success message
-        clear_status_line()
-        print(f"✅ {boss_name}: {total_players} players, {total_kc:,} total KC")
+        if publish:
+            record_result(boss_name, total_kc, total_players, partial=partial, timestamp=timestamp)
+        
+        # Keep the player -> boss index current with this boss's rows
+        if publish and player_index is not None:
+            try:
+                player_index.update_boss(boss_name, boss_data, timestamp, complete=not partial)
+            except Exception as e:
+                logger.warning(f"⚠️ Player index update failed for {boss_name}: {e}", extra={'boss': boss_name})
+        
+        logger.info(f"{'⏹️' if partial else '✅'} {boss_name}: {total_players} players, {total_kc:,} total KC"
+                    f"{' (partial)' if partial else ''}",
+                    extra={'boss': boss_name, 'players': total_players, 'total_kc': int(total_kc), 'partial': partial})
         
         return True
         
     except Exception as e:
-        clear_status_line()
-        print(f"❌ Error processing {boss_name}: {e}")
+        logger.error(f"❌ Error processing {boss_name}: {e}", extra={'boss': boss_name})
         return False
 
+def replay_archive(run_id=None):
+    """Feed a recorded run back through parse and save at full local speed"""
+    if response_archive is None:
+        logger.error("❌ No response archive available")
+        return
+    
+    run_id = run_id or response_archive.latest_run_id()
+    if not run_id:
+        logger.error("❌ No recorded runs found in archive")
+        return
+    
+    # Replayed totals go to their own folder: the live CSVs, results history and player index are untouched
+    replay_folder = os.path.join(OUTPUT_FOLDER, f"replay_{run_id}")
+    os.makedirs(replay_folder, exist_ok=True)
+    logger.info(f"📼 Replaying recorded run {run_id}...", extra={'run_id': run_id})
+    
+    # Group archived bodies by boss, keeping every attempt per page in fetch order
+    boss_pages = {}
+    for boss_name, page, fetched_at, body in response_archive.iter_run(run_id):
+        boss_pages.setdefault(boss_name, {}).setdefault(page, []).append((fetched_at, body))
+    
+    # The pages alone don't say whether they cover the table: use how each boss ended live
+    run_mode, outcomes = response_archive.run_info(run_id)
+    if run_mode:
+        logger.info(f"📼 Recorded run mode: {run_mode}", extra={'run_id': run_id, 'mode': run_mode})
+    
+    tracker = StatusTracker(len(boss_pages), MAX_PAGES)
+    successful_bosses = 0
+    flagged_bosses = []
+    parse_time = 0.0
+    parsed_pages = 0
+    
+    for boss_name, pages in boss_pages.items():
+        page_rows = {}
+        last_fetched_at = None
+        for page in sorted(pages):
+            # Same retry semantics as live: the first attempt that parses wins
+            rows = None
+            for fetched_at, body in pages[page]:
+                parse_start = time.perf_counter()
+                try:
+                    rows = parse_page(body)
+                except Exception as e:
+                    # A body live scraping would have retried (e.g. a malformed number)
+                    logger.warning(f"⚠️ {boss_name} page {page}: Unparseable archived body: {e}",
+                                   extra={'boss': boss_name, 'page': page, 'run_id': run_id})
+                    rows = None
+                parse_time += time.perf_counter() - parse_start
+                parsed_pages += 1
+                if rows:
+                    last_fetched_at = max(last_fetched_at or fetched_at, fetched_at)
+                    break
+            if rows is not None:
+                page_rows[page] = rows  # An empty table is kept: it marks an estimate's table end probe
+            if rows:
+                tracker.mark_page_complete()
+        
+        tracker.mark_boss_complete(boss_name)
+        outcome = outcomes.get(boss_name)
+        
+        if outcome == "estimated":
+            # Re-run the estimator on the sampled pages; a page with no new ranks was the end-of-table probe
+            sampled = {}
+            table_ends = False
+            for page in sorted(page_rows):
+                rows = page_rows[page]
+                if sampled and (not rows or min(rows.ranks) <= max(sampled[max(sampled)].ranks)):
+                    table_ends = True
+                    break
+                if rows:
+                    sampled[page] = rows
+            if 1 not in sampled:
+                logger.warning(f"⚠️ {boss_name}: Estimated live but page 1 is missing, skipping",
+                               extra={'boss': boss_name, 'run_id': run_id})
+                continue
+            estimate = estimate_totals(sampled, MAX_PAGES, table_ends=table_ends)
+            if save_boss_estimate(boss_name, estimate, tracker, output_folder=replay_folder,
+                                  timestamp=last_fetched_at, publish=False):
+                successful_bosses += 1
+            continue
+        
+        all_players_data = RowBatch()
+        for page in sorted(page_rows):
+            rows = page_rows[page]
+            # Skip a probe page that only repeated ranks already collected
+            if rows and not (all_players_data and rows.ranks[0] <= all_players_data.ranks[-1]):
+                all_players_data.extend(rows)
+        
+        # Anything not known to be a complete crawl is saved as partial (replay_<run>/partial/)
+        partial = outcome != "complete"
+        if partial:
+            flagged_bosses.append(boss_name)
+            if outcome is None:
+                logger.warning(f"⚠️ {boss_name}: No recorded outcome (older archive or unfinished boss), "
+                               f"saving as partial", extra={'boss': boss_name, 'run_id': run_id})
+        if process_and_save_boss_data(boss_name, all_players_data, tracker, partial=partial,
+                                      output_folder=replay_folder, timestamp=last_fetched_at, publish=False):
+            successful_bosses += 1
+    
+    logger.info(f"\n{'='*60}")
+    logger.info(f"✅ Replay complete!")
+    logger.info(f"📊 Successfully processed: {successful_bosses}/{len(boss_pages)} bosses")
+    if flagged_bosses:
+        logger.info(f"⏹️ Saved as partial: {', '.join(flagged_bosses)}", extra={'partial_bosses': flagged_bosses})
+    if parsed_pages:
+        logger.info(f"⏱️ Parse time: {parse_time:.2f}s for {parsed_pages} pages "
+              f"({parse_time / parsed_pages * 1000:.1f} ms/page)")
+    logger.info(f"📁 Check {replay_folder} for CSV files")
+    logger.info(f"{'='*60}")
+    flush_logs()
+
 def main():
-    print("🔄 Loading boss URLs...")
+    # Seed the results history from existing CSVs before this run overwrites them
+    if results_store is not None:
+        results_store.open()
+    
+    if ARCHIVE_MODE == "replay":
+        try:
+            replay_archive(REPLAY_RUN_ID)
+        finally:
+            parse_pool.shutdown()
+        return
+    
+    if ARCHIVE_MODE == "record" and response_archive is not None:
+        response_archive.start_run("estimate" if is_estimate_mode() else "full")
+    
+    logger.info("🔄 Loading boss URLs...")
     boss_urls = load_boss_urls(CSV_FILE)
     
     if not boss_urls:
-        print("❌ No URLs loaded")
+        logger.error("❌ No URLs loaded")
         return
     
-    print("📊 Analyzing boss data...")
+    logger.info("📊 Analyzing boss data...")
     
     boss_items = list(boss_urls.items())
     total_bosses = len(boss_items)
@@ -279,66 +656,187 @@ def main():
     # Initialize status tracker
     tracker = StatusTracker(total_bosses, MAX_PAGES)
     
-    successful_bosses = 0
+    # Optional deadline: stop cleanly and keep what was fetched
+    deadline_minutes = get_run_deadline_minutes()
+    deadline = time.time() + deadline_minutes * 60 if deadline_minutes else None
+    manager = ParallelManager(WORKERS, max_pending=MAX_PENDING, deadline=deadline)
     
-    # Process ALL bosses with ThreadPoolExecutor
-    print(f"\n🚀 Starting concurrent processing of {total_bosses} bosses...")
-    
-    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
-        # Submit all bosses at once
-        futures = {}
-        for worker_id, (boss_name, url) in enumerate(boss_items):
-            future = executor.submit(
-                scrape_boss_worker, 
-                boss_name, 
-                url, 
-                worker_id % WORKERS,
-                tracker,
-                MAX_PAGES
-            )
-            futures[future] = boss_name  # Future is KEY, boss_name is VALUE
-        
-        # Track completed futures
-        completed_futures = []
-        
-        # Process results as they complete
-        for future in as_completed(futures):
-            boss_name = futures[future]
-            try:
-                boss_name, boss_data = future.result()
-                
-                if process_and_save_boss_data(boss_name, boss_data, tracker):
-                    successful_bosses += 1
-                
-                # Update status display
-                print_status(tracker)
-                
-                # Track this completed future
-                completed_futures.append(future)
-                
-                # Dynamic delay based on recent activity
-                if len(completed_futures) % 5 == 0:  # Every 5 bosses
-                    time.sleep(BOSS_DELAY * 2)  # Slightly longer pause
-                
-            except Exception as e:
-                clear_status_line()
-                print(f"❌ Error processing {boss_name}: {e}")
+    logger.info(f"\n🚀 Starting concurrent processing of {total_bosses} bosses..."
+                f"{f' (deadline: {deadline_minutes:g} min)' if deadline_minutes else ''}")
+    
+    # Progress bar is redrawn from tracker snapshots on its own thread
+    status_display = StatusDisplay(tracker, render_status).start()
+    
+    try:
+        successful_bosses, partial_bosses, skipped_bosses = run_bosses(boss_items, tracker, manager)
+    finally:
+        status_display.stop()
+        parse_pool.shutdown()
     
     # Final status
-    clear_status_line()
-    print(f"\n{'='*60}")
-    print(f"✅ Scraping complete!")
-    print(f"📊 Successfully processed: {successful_bosses}/{len(boss_urls)} bosses")
+    logger.info(f"\n{'='*60}")
+    logger.info(f"✅ Scraping complete!" if not (partial_bosses or skipped_bosses) else f"⏹️ Scraping stopped early!")
+    logger.info(f"📊 Successfully processed: {successful_bosses}/{len(boss_urls)} bosses")
+    if partial_bosses:
+        logger.info(f"⏹️ Partial results: {', '.join(partial_bosses)}", extra={'partial_bosses': partial_bosses})
+    if skipped_bosses:
+        logger.info(f"⏭️ Not started: {', '.join(skipped_bosses)}", extra={'skipped_bosses': skipped_bosses})
     
     # Show time statistics
     elapsed = time.time() - tracker.start_time
     avg_time_per_boss = elapsed / successful_bosses if successful_bosses > 0 else 0
-    print(f"⏱️ Total time: {str(timedelta(seconds=int(elapsed)))}")
-    print(f"📈 Average time per boss: {avg_time_per_boss:.1f} seconds")
-    print(f"📁 Check {OUTPUT_FOLDER} for CSV files")
-    print(f"{'='*60}")
+    logger.info(f"⏱️ Total time: {str(timedelta(seconds=int(elapsed)))}",
+                extra={'elapsed': elapsed, 'successful_bosses': successful_bosses})
+    logger.info(f"📈 Average time per boss: {avg_time_per_boss:.1f} seconds")
+    logger.info(f"📁 Check {OUTPUT_FOLDER} for CSV files")
+    logger.info(f"{'='*60}")
+    flush_logs()
+
+def get_run_deadline_minutes():
+    """Run deadline in minutes from --deadline N, falling back to RUN_DEADLINE_MINUTES"""
+    if '--deadline' in sys.argv:
+        try:
+            return float(sys.argv[sys.argv.index('--deadline') + 1])
+        except (IndexError, ValueError):
+            logger.warning("⚠️ --deadline needs a number of minutes, ignoring it")
+    return RUN_DEADLINE_MINUTES
+
+def is_estimate_mode():
+    return ESTIMATE_MODE or '--estimate' in sys.argv
+
+def record_outcome(boss_name, outcome):
+    """Note in the archive how a boss ended, so replay knows what its pages cover"""
+    if ARCHIVE_MODE != "record" or response_archive is None:
+        return
+    try:
+        response_archive.record_outcome(boss_name, outcome)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to archive outcome for {boss_name}: {e}", extra={'boss': boss_name})
+
+def run_bosses(boss_items, tracker, manager):
+    """Scrape and save bosses on the run executor, most valuable first.
+
+    Returns (saved count, names saved as partial, names never started)."""
+    successful_bosses = 0
+    partial_bosses = []
+    completed_bosses = []
+    
+    # Highest-value bosses first; worker ids follow that order
+    boss_items = sorted(boss_items, key=lambda item: boss_priority(item[0]))
+    tasks = [(boss_name, url, worker_id % WORKERS) for worker_id, (boss_name, url) in enumerate(boss_items)]
+    
+    estimate_mode = is_estimate_mode()
+    
+    def scrape_task(task):
+        boss_name, url, worker_id = task
+        if estimate_mode:
+            return estimate_boss_worker(boss_name, url, worker_id, tracker, MAX_PAGES, manager.should_stop)
+        return scrape_boss_worker(boss_name, url, worker_id, tracker, MAX_PAGES, manager.should_stop) + (None,)
+    
+    def save_result(task, result):
+        nonlocal successful_bosses
+        boss_name, boss_data, partial, estimate = result
+        try:
+            if estimate is not None:
+                record_outcome(boss_name, "estimated")
+                if save_boss_estimate(boss_name, estimate, tracker):
+                    successful_bosses += 1
+            else:
+                record_outcome(boss_name, "partial" if partial else "complete")
+                if process_and_save_boss_data(boss_name, boss_data, tracker, partial):
+                    successful_bosses += 1
+                    if partial:
+                        partial_bosses.append(boss_name)
+            
+            # Track this completed boss
+            completed_bosses.append(boss_name)
+            
+            # Dynamic delay based on recent activity
+            if len(completed_bosses) % 5 == 0:  # Every 5 bosses
+                manager.sleep(BOSS_DELAY * 2)  # Slightly longer pause
+            
+        except Exception as e:
+            logger.error(f"❌ Error processing {boss_name}: {e}", extra={'boss': boss_name})
+    
+    _, skipped = manager.process_batch(tasks, scrape_task, on_result=save_result)
+    
+    return successful_bosses, partial_bosses, [boss_name for boss_name, _, _ in skipped]
+
+def find_player(name):
+    """Print which bosses a player (exact, prefix or fuzzy match) appears on, most recent KC change first"""
+    if player_index is None:
+        logger.error("❌ No player index available")
+        return
+    
+    player_index.load()
+    start = time.perf_counter()
+    matches = player_index.find(name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if not matches:
+        logger.info(f"🔍 No players matching '{name}'")
+    for name_key, bosses in matches:
+        display_name = next(iter(bosses.values()))['display_name'] if bosses else name_key
+        logger.info(f"\n👤 {display_name}")
+        for boss_name, entry in sorted(bosses.items(), key=lambda item: -item[1]['last_changed']):
+            last_changed = datetime.fromtimestamp(entry['last_changed']).strftime("%Y-%m-%d %H:%M")
+            last_seen = datetime.fromtimestamp(entry['last_seen']).strftime("%Y-%m-%d %H:%M")
+            logger.info(f"   {boss_name}: rank {entry['rank']:,}, {entry['kc']:,} KC "
+                        f"(last change {last_changed}, last seen {last_seen})")
+    logger.info(f"\n⏱️ Lookup took {elapsed_ms:.2f} ms")
+    flush_logs()
+
+def run_profiled():
+    """Run a single non-interactive pass under the profiler and write reports"""
+    profiler = RunProfiler(
+        OUTPUT_FOLDER,
+        sample_interval=0 if '--no-sampling' in sys.argv else PROFILE_SAMPLE_INTERVAL,
+        track_memory='--profile-memory' in sys.argv,
+        top_n=PROFILE_TOP_N
+    )
+    profiler.start()
+    try:
+        main()
+    except KeyboardInterrupt:
+        clear_status_line()
+        print("\n\n⚠️ Profiling run interrupted, writing partial reports")
+    finally:
+        profiler.stop()
+        report_folder = profiler.write_reports()
+        print(f"🔬 Profile reports written to {report_folder}")
 
 if __name__ == "__main__":
+    print_startup_diagnostics()
+    
+    if '--profile' in sys.argv:
+        run_profiled()
+        sys.exit()
+    
+    if '--serve-only' in sys.argv:
+        # Post-run mode: serve the results already on disk until Ctrl+C
+        if results_store is None or ResultsServer is None:
+            print("❌ Results API unavailable - see the errors above")
+            sys.exit(1)
+        try:
+            ResultsServer(results_store, API_HOST, API_PORT).serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Results API stopped")
+        sys.exit()
+    
+    if '--find' in sys.argv:
+        try:
+            find_player(sys.argv[sys.argv.index('--find') + 1])
+        except IndexError:
+            print('Usage: python main.py --find "player name"')
+        sys.exit()
+    
+    if '--serve' in sys.argv:
+        # Daemon mode: serve results in the background while runs repeat below
+        if results_store is None or ResultsServer is None:
+            print("❌ Results API unavailable - see the errors above; runs continue without it")
+        else:
+            results_server = ResultsServer(results_store, API_HOST, API_PORT).start()
+    
     run_count = 0
     
     while True:
@@ -351,17 +849,25 @@ if __name__ == "__main__":
                 
                 # Clear Python's module cache for critical modules
                 import importlib
-                modules_to_reload = ['config', 'csv_loader', 'scraper', 'header_rotator', 'rate_limiter']
+                modules_to_reload = ['config', 'csv_loader', 'response_archive', 'parse_pool', 'scraper', 'header_rotator', 'rate_limiter', 'parallel_manager', 'kc_estimator', 'player_index']
                 
                 for module_name in modules_to_reload:
                     if module_name in sys.modules:
                         importlib.reload(sys.modules[module_name])
                 
                 # Re-import the specific objects
-                from config import CSV_FILE, OUTPUT_FOLDER, WORKERS, BOSS_DELAY, MAX_PAGES
+                from config import CSV_FILE, OUTPUT_FOLDER, WORKERS, BOSS_DELAY, MAX_PAGES, ARCHIVE_MODE, REPLAY_RUN_ID
+                from config import PROFILE_TOP_N, PROFILE_SAMPLE_INTERVAL, MAX_PENDING, RUN_DEADLINE_MINUTES
+                from config import ESTIMATE_MODE, ESTIMATE_STRATA, ESTIMATE_MAX_ERROR
+                from config import API_HOST, API_PORT
                 from csv_loader import load_boss_urls
-                from scraper import scrape_page
+                from response_archive import global_response_archive as response_archive
+                from parse_pool import global_parse_pool as parse_pool
+                from player_index import global_player_index as player_index
+                from scraper import scrape_page, parse_page, wait_or_stop
                 from header_rotator import global_header_rotator as header_rotator
+                from parallel_manager import ParallelManager
+                from kc_estimator import choose_sample_pages, estimate_totals, needs_full_crawl, relative_error
                 
                 # Handle rate limiter specially
                 try:
@@ -0,0 +1,29 @@
+# page_parser.py
+# Kept free of config/logging imports: parse worker processes import this module on their own
+from array import array
+from bs4 import BeautifulSoup
+from row_batch import parse_number
+
+def parse_page_columns(html):
+    """Extract (ranks, names, scores) columns from a HiScores page.
+
+    ranks and scores are int64 arrays and names a list of str, so the result
+    pickles cheaply back from a parse worker process. Returns None when the
+    page has no table (usually a block page)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find the main table
+    table = soup.find('table')
+    if not table:
+        return None
+    
+    ranks = array('q')
+    names = []
+    scores = array('q')
+    for tr in table.find_all('tr')[1:]:  # Skip header row
+        cells = tr.find_all('td')
+        if len(cells) >= 3:
+            ranks.append(parse_number(cells[0].get_text(strip=True)))
+            names.append(cells[1].get_text(strip=True))
+            scores.append(parse_number(cells[2].get_text(strip=True)))
+    return ranks, names, scores
\ No newline at end of file
@@ -1,38 +1,123 @@
 # parallel_manager.py
+import heapq
 import time
 import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from structured_log import get_logger
+
+logger = get_logger("parallel")
 
 class ParallelManager:
-    def __init__(self, max_workers, rate_limit_per_minute=25):
+    """Run executor with bounded submission, priorities and cooperative cancellation.
+
+    Tasks are submitted lowest priority key first, never more than
+    `max_pending` at a time, so a slow pool applies backpressure instead of
+    queueing everything up front. Once cancel() is called or the deadline
+    passes no new tasks start; running tasks are expected to poll
+    should_stop() and return early with whatever they have.
+    """
+
+    def __init__(self, max_workers, rate_limit_per_minute=None, max_pending=None, deadline=None):
         self.max_workers = max_workers
         self.rate_limit = rate_limit_per_minute
-        self.last_request_time = 0
-        self.min_interval = 60.0 / rate_limit_per_minute
-        
-    def process_batch(self, tasks, task_function):
-        """Process tasks with controlled parallelism and rate limiting"""
+        self.last_submit_time = 0
+        self.min_interval = 60.0 / rate_limit_per_minute if rate_limit_per_minute else 0
+        self.max_pending = max_pending or max_workers * 2
+        self.deadline = deadline  # Absolute time.time() value, or None
+        self.cancel_event = Event()
+
+    def cancel(self):
+        """Stop submitting new tasks and tell running ones to wind down"""
+        self.cancel_event.set()
+
+    def should_stop(self):
+        """True once cancelled or past the deadline"""
+        if self.cancel_event.is_set():
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def time_remaining(self):
+        """Seconds until the deadline, or None if there is none"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def sleep(self, seconds):
+        """Sleep that wakes early on cancel or deadline; returns False if stopped"""
+        end_time = time.time() + seconds
+        while True:
+            if self.should_stop():
+                return False
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return True
+            timeout = min(remaining, 1.0)
+            if self.deadline is not None:
+                timeout = min(timeout, max(self.deadline - time.time(), 0.01))
+            self.cancel_event.wait(timeout)
+
+    def _throttle_submission(self):
+        """Space submissions at least min_interval apart"""
+        if not self.min_interval:
+            return
+        time_since_last = time.time() - self.last_submit_time
+        if time_since_last < self.min_interval:
+            self.sleep(self.min_interval - time_since_last + random.uniform(0, 0.1))
+        self.last_submit_time = time.time()
+
+    def process_batch(self, tasks, task_function, priority=None, on_result=None):
+        """Process tasks with bounded submission, priorities and cancellation.
+
+        priority(task) returns a sort key (lowest runs first); on_result(task, result)
+        is called on this thread as each task finishes. Returns (results, skipped),
+        where skipped holds the tasks never started because the run was stopped.
+        """
         results = []
+        skipped = []
+        queue = [(priority(task) if priority else 0, index, task) for index, task in enumerate(tasks)]
+        heapq.heapify(queue)
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {executor.submit(task_function, task): task for task in tasks}
+            pending = {}
+            try:
+                self._run_queue(executor, queue, pending, task_function, on_result, results, skipped)
+            except BaseException:
+                # Ctrl+C or a failing callback: let running tasks wind down instead of blocking shutdown
+                self.cancel()
+                raise
+        
+        return results, skipped
+
+    def _run_queue(self, executor, queue, pending, task_function, on_result, results, skipped):
+        """Submit/collect loop behind process_batch"""
+        while queue or pending:
+            # Top up in-flight work; backpressure comes from the max_pending cap
+            while queue and len(pending) < self.max_pending and not self.should_stop():
+                self._throttle_submission()
+                _, _, task = heapq.heappop(queue)
+                pending[executor.submit(task_function, task)] = task
             
-            for future in as_completed(future_to_task):
-                # Rate limiting
-                current_time = time.time()
-                time_since_last = current_time - self.last_request_time
-                
-                if time_since_last < self.min_interval:
-                    sleep_time = self.min_interval - time_since_last
-                    time.sleep(sleep_time + random.uniform(0, 0.1))
-                
-                self.last_request_time = time.time()
-                
+            if queue and self.should_stop():
+                skipped.extend(task for _, _, task in sorted(queue))
+                queue = []
+                logger.warning(f"⏹️ Run stopped: {len(skipped)} tasks not started",
+                               extra={'skipped': len(skipped)})
+            
+            if not pending:
+                break
+            
+            # Wake up at the deadline even if nothing finishes, so submission stops on time
+            timeout = None if self.should_stop() else self.time_remaining()
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                task = pending.pop(future)
                 try:
                     result = future.result()
-                    results.append(result)
                 except Exception as e:
-                    print(f"Task failed: {e}")
-        
-        return results
\ No newline at end of file
+                    logger.error(f"Task failed: {e}")
+                    continue
+                results.append(result)
+                if on_result:
+                    on_result(task, result)
\ No newline at end of file
@@ -0,0 +1,94 @@
+# parse_pool.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from page_parser import parse_page_columns
+from structured_log import get_logger
+
+logger = get_logger("parse_pool")
+
+class ParsePool:
+    """Bounded pool of parse worker processes fed with raw page bodies.
+
+    Fetch threads hand over the HTML and block on the result without holding
+    the GIL, so BeautifulSoup no longer stalls other workers' network I/O.
+    At most `queue_size` bodies are queued or being parsed; beyond that
+    fetchers wait. Each fetcher blocks on its own page's result (it needs the
+    row count to decide whether to go on), so there are never more bodies in
+    flight than fetch workers: queue_size only throttles below that.
+
+    Workers are spawned, so each one re-imports the launching script as
+    __mp_main__ and with it that script's module-level imports; startup
+    output belongs under the script's __main__ guard.
+    """
+
+    def __init__(self, workers, queue_size, fetchers=None):
+        if queue_size < 1:
+            raise ValueError(f"parse queue size must be at least 1, got {queue_size}")
+        if fetchers is not None and queue_size > fetchers:
+            # Fetchers wait on their own page, so a larger limit can never be reached
+            if workers > 0:
+                logger.info(f"🧩 Parse queue size {queue_size} capped to the {fetchers} fetch workers")
+            queue_size = fetchers
+        self.workers = workers
+        self.queue_size = queue_size
+        self.slots = BoundedSemaphore(queue_size)
+        self.executor = None
+        self.lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                # spawn on every platform: forking a process with live fetch/log threads is unsafe
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"🧩 Started {self.workers} parse workers (queue: {self.queue_size})")
+            return self.executor
+
+    def parse_columns(self, html):
+        """Parse one body in a worker process; returns parse_page_columns' result"""
+        executor = self._get_executor()
+        self.slots.acquire()
+        try:
+            future = executor.submit(parse_page_columns, html)
+        except BrokenProcessPool as e:
+            self.slots.release()
+            return self._parse_after_break(executor, html, e)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            return self._parse_after_break(executor, html, e)
+
+    def _parse_after_break(self, executor, html, error):
+        # A crashed worker takes the pool down; parse here and start a fresh pool next time
+        logger.error(f"❌ Parse pool broken ({error}), parsing in-process")
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False)
+        return parse_page_columns(html)
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+
+# Create global instance
+try:
+    from config import PARSE_WORKERS, PARSE_QUEUE_SIZE, WORKERS
+    global_parse_pool = ParsePool(PARSE_WORKERS, PARSE_QUEUE_SIZE, fetchers=WORKERS)
+except Exception as e:
+    logger.error(f"❌ Failed to create parse pool: {e}")
+    global_parse_pool = ParsePool(0, 1)
\ No newline at end of file
@@ -0,0 +1,220 @@
+# player_index.py
+import bisect
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from threading import Lock
+from structured_log import get_logger
+
+logger = get_logger("player_index")
+
+_SEPARATORS = re.compile(r'[\s_\-\xa0]+')
+
+def normalize_name(name):
+    """Case- and separator-insensitive key: 'Iron_Man-X' and 'iron man x' match"""
+    return _SEPARATORS.sub(' ', name).strip().lower()
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerIndex:
+    """Inverted index from player name to the bosses they appear on.
+
+    Held in memory for lookups, with a sorted key list for prefix search and
+    a trigram index for fuzzy search. It is persisted to SQLite and updated
+    incrementally: each saved boss upserts only that boss's rows, and a
+    complete save also drops players no longer listed for that boss.
+    Each entry holds display name, rank, latest KC, when the player was last
+    seen on the boss and when their KC last changed.
+    """
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.conn = None
+        self.lock = Lock()
+        self.players = {}     # name_key -> {boss_name: entry}
+        self.boss_keys = {}   # boss_name -> set of name_keys
+        self.sorted_keys = []
+        self.trigrams = {}    # trigram -> set of name_keys
+        self.trigram_counts = {}
+        self.loaded = False
+
+    def _connect(self):
+        if self.conn is None:
+            folder = os.path.dirname(self.index_file)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.conn = sqlite3.connect(self.index_file, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS player_bosses (
+                    name_key     TEXT    NOT NULL,
+                    boss_name    TEXT    NOT NULL,
+                    display_name TEXT    NOT NULL,
+                    rank         INTEGER NOT NULL,
+                    kc           INTEGER NOT NULL,
+                    last_seen    REAL    NOT NULL,
+                    last_changed REAL    NOT NULL,
+                    PRIMARY KEY (name_key, boss_name)
+                )
+            """)
+            self.conn.commit()
+        return self.conn
+
+    def load(self):
+        """Load the persisted index now instead of on first use"""
+        with self.lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        """Load the persisted index into memory once"""
+        if self.loaded:
+            return
+        rows = self._connect().execute("SELECT * FROM player_bosses").fetchall()
+        for name_key, boss_name, display_name, rank, kc, last_seen, last_changed in rows:
+            self._add_key(name_key)
+            self.boss_keys.setdefault(boss_name, set()).add(name_key)
+            self.players[name_key][boss_name] = {
+                'display_name': display_name,
+                'rank': rank,
+                'kc': kc,
+                'last_seen': last_seen,
+                'last_changed': last_changed,
+            }
+        self.loaded = True
+        if rows:
+            logger.info(f"📇 Player index loaded: {len(self.players)} players", extra={'players': len(self.players)})
+
+    def _add_key(self, name_key):
+        if name_key in self.players:
+            return
+        self.players[name_key] = {}
+        bisect.insort(self.sorted_keys, name_key)
+        trigrams = _trigrams(name_key)
+        self.trigram_counts[name_key] = len(trigrams)
+        for trigram in trigrams:
+            self.trigrams.setdefault(trigram, set()).add(name_key)
+
+    def _remove_entry(self, name_key, boss_name):
+        bosses = self.players[name_key]
+        del bosses[boss_name]
+        if bosses:
+            return
+        # Last boss gone: drop the player from the search structures too
+        del self.players[name_key]
+        del self.sorted_keys[bisect.bisect_left(self.sorted_keys, name_key)]
+        del self.trigram_counts[name_key]
+        for trigram in _trigrams(name_key):
+            postings = self.trigrams[trigram]
+            postings.discard(name_key)
+            if not postings:
+                del self.trigrams[trigram]
+
+    def update_boss(self, boss_name, batch, timestamp=None, complete=False):
+        """Fold one boss's freshly saved RowBatch into the index
+
+        timestamp (epoch seconds) is when the rows were fetched, now by default.
+        complete=True means the batch is the boss's whole table, so players
+        missing from it (renamed, banned, fallen off) are removed for this boss.
+        Returns (upserted, removed)."""
+        timestamp = timestamp or time.time()
+        changed = []
+        with self.lock:
+            self._ensure_loaded()
+            boss_keys = self.boss_keys.setdefault(boss_name, set())
+            seen_keys = set()
+            for rank, display_name, kc in batch.rows():
+                name_key = normalize_name(display_name)
+                self._add_key(name_key)
+                seen_keys.add(name_key)
+                entry = self.players[name_key].get(boss_name)
+                if entry is None or entry['kc'] != kc:
+                    last_changed = timestamp
+                else:
+                    last_changed = entry['last_changed']
+                entry = {
+                    'display_name': display_name,
+                    'rank': rank,
+                    'kc': kc,
+                    'last_seen': timestamp,
+                    'last_changed': last_changed,
+                }
+                self.players[name_key][boss_name] = entry
+                changed.append((name_key, boss_name, display_name, rank, kc, timestamp, last_changed))
+            
+            stale_keys = boss_keys - seen_keys if complete else set()
+            for name_key in stale_keys:
+                self._remove_entry(name_key, boss_name)
+            boss_keys -= stale_keys
+            boss_keys |= seen_keys
+            
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO player_bosses VALUES (?, ?, ?, ?, ?, ?, ?)", changed)
+            conn.executemany("DELETE FROM player_bosses WHERE name_key = ? AND boss_name = ?",
+                             [(name_key, boss_name) for name_key in stale_keys])
+            conn.commit()
+        return len(changed), len(stale_keys)
+
+    def lookup(self, name):
+        """{boss_name: entry} for an exact (normalized) name, or {}"""
+        with self.lock:
+            self._ensure_loaded()
+            return dict(self.players.get(normalize_name(name), {}))
+
+    def search_prefix(self, prefix, limit=20):
+        """[(name_key, {boss_name: entry})] for names starting with prefix"""
+        prefix = normalize_name(prefix)
+        with self.lock:
+            self._ensure_loaded()
+            start = bisect.bisect_left(self.sorted_keys, prefix)
+            matches = []
+            for name_key in self.sorted_keys[start:start + limit]:
+                if not name_key.startswith(prefix):
+                    break
+                matches.append((name_key, dict(self.players[name_key])))
+            return matches
+
+    def search_fuzzy(self, name, limit=10, min_similarity=0.4):
+        """[(similarity, name_key, {boss_name: entry})] ranked by trigram similarity"""
+        name_key = normalize_name(name)
+        query = _trigrams(name_key)
+        with self.lock:
+            self._ensure_loaded()
+            shared = Counter()
+            for trigram in query:
+                shared.update(self.trigrams.get(trigram, ()))
+            scored = []
+            for candidate, common in shared.items():
+                # Dice coefficient over trigram sets
+                similarity = 2 * common / (len(query) + self.trigram_counts[candidate])
+                if similarity >= min_similarity:
+                    scored.append((similarity, candidate))
+            scored.sort(key=lambda item: (-item[0], item[1]))
+            return [(similarity, candidate, dict(self.players[candidate]))
+                    for similarity, candidate in scored[:limit]]
+
+    def find(self, name, limit=10):
+        """Best-effort lookup: exact match, else prefix matches, else fuzzy matches"""
+        exact = self.lookup(name)
+        if exact:
+            return [(normalize_name(name), exact)]
+        prefix_matches = self.search_prefix(name, limit)
+        if prefix_matches:
+            return prefix_matches
+        return [(name_key, bosses) for _, name_key, bosses in self.search_fuzzy(name, limit)]
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+# Create global instance
+try:
+    from config import PLAYER_INDEX_FILE
+    global_player_index = PlayerIndex(PLAYER_INDEX_FILE)
+except Exception as e:
+    logger.error(f"❌ Failed to create player index: {e}")
+    global_player_index = None
\ No newline at end of file
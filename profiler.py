@@ -0,0 +1,208 @@
+# profiler.py
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from structured_log import get_logger
+
+logger = get_logger("profiler")
+
+# Profiler for the current run; None when profiling is off
+active_profiler = None
+
+# Before 3.12 cProfile is per-thread, so each worker thread profiles its own
+# sections. From 3.12 it is built on sys.monitoring and one enabled profile
+# records every thread into the same call stack, which corrupts the stats;
+# there the CPU tables come from the section-scoped stack samples instead.
+DETERMINISTIC_CPU_PROFILE = sys.version_info < (3, 12)
+
+def profiled(func):
+    """Mark a hot-path function as a profiling section"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = active_profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        profiler.enter_section()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.exit_section()
+    return wrapper
+
+# Every profiled wrapper shares this code object; the sampler uses it to find section roots
+_WRAPPER_CODE = profiled(lambda: None).__code__
+
+class RunProfiler:
+    """CPU, sampling and memory profiling scoped to @profiled sections.
+
+    - CPU: per-thread cProfile merged into top-N hotspot tables (before 3.12)
+    - Sampling: stacks of threads inside a section, written as folded stacks
+      (flamegraph.pl / speedscope compatible) and summarised as own and
+      cumulative hotspot tables; the only CPU view from 3.12
+    - Memory: tracemalloc top allocation sites and peak usage
+    """
+
+    def __init__(self, output_folder, sample_interval=0.005, track_memory=False, top_n=25):
+        self.output_folder = output_folder
+        self.sample_interval = sample_interval
+        self.track_memory = track_memory
+        self.top_n = top_n
+        
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.profiles = []
+        self.active_threads = set()
+        self.stack_counts = Counter()
+        self.samples = 0
+        
+        self.sampler_thread = None
+        self.stop_event = threading.Event()
+        self.start_time = None
+        self.wall_time = 0.0
+
+    def start(self):
+        """Install this profiler and start the optional sampler / memory tracking"""
+        global active_profiler
+        self.start_time = time.perf_counter()
+        if self.track_memory:
+            tracemalloc.start()
+        if not DETERMINISTIC_CPU_PROFILE and not self.sample_interval:
+            self.sample_interval = 0.005
+            logger.warning("⚠️ Sampling is the only CPU profile on Python 3.12+, keeping it on at 5 ms")
+        if self.sample_interval:
+            self.sampler_thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self.sampler_thread.start()
+        active_profiler = self
+        logger.info(f"🔬 Profiling enabled (sampling: {'%.1f ms' % (self.sample_interval * 1000) if self.sample_interval else 'off'}, "
+              f"memory: {'on' if self.track_memory else 'off'})")
+
+    def stop(self):
+        """Stop collecting; reports are written by write_reports()"""
+        global active_profiler
+        active_profiler = None
+        self.wall_time = time.perf_counter() - self.start_time
+        if self.sampler_thread is not None:
+            self.stop_event.set()
+            self.sampler_thread.join()
+
+    def enter_section(self):
+        depth = getattr(self.local, 'depth', 0)
+        self.local.depth = depth + 1
+        if depth:
+            return  # Nested section: the outer one is already profiling
+        with self.lock:
+            self.active_threads.add(threading.get_ident())
+        if DETERMINISTIC_CPU_PROFILE:
+            profile = getattr(self.local, 'profile', None)
+            if profile is None:
+                profile = cProfile.Profile()
+                self.local.profile = profile
+                with self.lock:
+                    self.profiles.append(profile)
+            profile.enable()
+
+    def exit_section(self):
+        self.local.depth -= 1
+        if self.local.depth:
+            return
+        if DETERMINISTIC_CPU_PROFILE:
+            self.local.profile.disable()
+        with self.lock:
+            self.active_threads.discard(threading.get_ident())
+
+    def _sample_loop(self):
+        while not self.stop_event.wait(self.sample_interval):
+            with self.lock:
+                thread_ids = list(self.active_threads)
+            frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stack = self._section_stack(frame)
+                    if stack:
+                        self.stack_counts[stack] += 1
+                        self.samples += 1
+
+    def _section_stack(self, frame):
+        """Folded stack from the outermost section function down to the leaf"""
+        stack = []
+        root = None
+        while frame is not None:
+            if frame.f_code is _WRAPPER_CODE:
+                root = len(stack)
+            else:
+                stack.append(frame)
+            frame = frame.f_back
+        if root is None:
+            return None
+        return ';'.join(self._frame_label(f) for f in reversed(stack[:root]))
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def write_reports(self):
+        """Write hotspots.txt, stacks.folded, cpu.prof (before 3.12) and memory.txt; return the folder"""
+        report_folder = os.path.join(self.output_folder, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(report_folder, exist_ok=True)
+        
+        summary = io.StringIO()
+        summary.write(f"Wall time: {self.wall_time:.2f}s\n\n")
+        
+        # Deterministic CPU profile (per-thread cProfile, before 3.12 only)
+        if self.profiles:
+            stats = pstats.Stats(*self.profiles, stream=summary)
+            stats.dump_stats(os.path.join(report_folder, "cpu.prof"))
+            summary.write(f"=== CPU hotspots by own time (top {self.top_n}) ===\n")
+            stats.sort_stats('tottime').print_stats(self.top_n)
+            summary.write(f"=== CPU hotspots by cumulative time (top {self.top_n}) ===\n")
+            stats.sort_stats('cumulative').print_stats(self.top_n)
+        
+        # Sampled stacks
+        if self.stack_counts:
+            with open(os.path.join(report_folder, "stacks.folded"), 'w', encoding='utf-8') as f:
+                for stack, count in self.stack_counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            
+            # Own time: samples with the function as the leaf; cumulative: samples with it anywhere
+            own_counts = Counter()
+            cumulative_counts = Counter()
+            for stack, count in self.stack_counts.items():
+                frames = stack.split(';')
+                own_counts[frames[-1]] += count
+                for label in set(frames):
+                    cumulative_counts[label] += count
+            for title, counts in (("own", own_counts), ("cumulative", cumulative_counts)):
+                summary.write(f"=== Sampled hotspots by {title} time ({self.samples} samples "
+                              f"every {self.sample_interval * 1000:.1f} ms, top {self.top_n}) ===\n")
+                summary.write(f"{'share':>7}  {'samples':>7}  {'~seconds':>8}  function\n")
+                for label, count in counts.most_common(self.top_n):
+                    summary.write(f"{count / self.samples * 100:6.1f}%  {count:7d}  "
+                                  f"{count * self.sample_interval:8.2f}  {label}\n")
+                summary.write("\n")
+        
+        # Memory allocations
+        if self.track_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(os.path.join(report_folder, "memory.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"Current: {current / 1024 / 1024:.1f} MiB, peak: {peak / 1024 / 1024:.1f} MiB\n\n")
+                for stat in snapshot.statistics('lineno')[:self.top_n]:
+                    f.write(f"{stat}\n")
+            summary.write(f"=== Memory ===\nCurrent: {current / 1024 / 1024:.1f} MiB, peak: {peak / 1024 / 1024:.1f} MiB "
+                          f"(top allocation sites in memory.txt)\n")
+        
+        with open(os.path.join(report_folder, "hotspots.txt"), 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        
+        return report_folder
\ No newline at end of file
@@ -0,0 +1,151 @@
+# response_archive.py
+import os
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from threading import Lock
+from structured_log import get_logger
+
+logger = get_logger("archive")
+
+class ResponseArchive:
+    """Compressed, indexed on-disk archive of raw HiScores responses.
+
+    Every body fetched by scrape_page is stored zlib-compressed in a SQLite
+    file keyed by run, boss, page and fetch time, so old runs can be fed back
+    through the parse/aggregate pipeline without touching the network.
+    Each run also records its mode ("full" or "estimate") and how every saved
+    boss ended ("complete", "partial" or "estimated"), since the archived
+    pages alone do not say whether they cover the whole table.
+    """
+
+    def __init__(self, archive_file):
+        self.archive_file = archive_file
+        self.run_id = None
+        self.conn = None
+        self.lock = Lock()
+
+    def _connect(self):
+        """Open the archive lazily and create the schema on first use"""
+        if self.conn is None:
+            folder = os.path.dirname(self.archive_file)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.conn = sqlite3.connect(self.archive_file, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    run_id      TEXT    NOT NULL,
+                    boss_name   TEXT    NOT NULL,
+                    page        INTEGER NOT NULL,
+                    fetched_at  REAL    NOT NULL,
+                    url         TEXT,
+                    status_code INTEGER,
+                    body        BLOB    NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_responses_key
+                ON responses (run_id, boss_name, page, fetched_at)
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id     TEXT PRIMARY KEY,
+                    mode       TEXT NOT NULL,
+                    started_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS boss_outcomes (
+                    run_id    TEXT NOT NULL,
+                    boss_name TEXT NOT NULL,
+                    outcome   TEXT NOT NULL,
+                    PRIMARY KEY (run_id, boss_name)
+                )
+            """)
+            self.conn.commit()
+        return self.conn
+
+    def start_run(self, mode="full"):
+        """Begin a new recording run and return its id"""
+        with self.lock:
+            conn = self._connect()
+            self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?)", (self.run_id, mode, time.time()))
+            conn.commit()
+        logger.info(f"📼 Recording responses to run {self.run_id} ({mode})")
+        return self.run_id
+
+    def record_outcome(self, boss_name, outcome):
+        """Store how a boss ended in the current run (complete, partial or estimated)"""
+        if self.run_id is None:
+            return
+        with self.lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO boss_outcomes VALUES (?, ?, ?)", (self.run_id, boss_name, outcome))
+            conn.commit()
+
+    def run_info(self, run_id):
+        """Return (mode, {boss_name: outcome}) for a run; mode is None for runs recorded without it"""
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute("SELECT mode FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            outcomes = dict(conn.execute(
+                "SELECT boss_name, outcome FROM boss_outcomes WHERE run_id = ?", (run_id,)
+            ).fetchall())
+        return (row[0] if row else None), outcomes
+
+    def record(self, boss_name, page, url, status_code, body):
+        """Store one response body for the current run"""
+        if self.run_id is None:
+            return
+        compressed = zlib.compress(body.encode('utf-8'), 6)
+        with self.lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, boss_name, page, time.time(), url, status_code, compressed)
+            )
+            conn.commit()
+
+    def list_runs(self):
+        """Return (run_id, responses, bosses, started_at) for every recorded run"""
+        with self.lock:
+            cursor = self._connect().execute("""
+                SELECT run_id, COUNT(*), COUNT(DISTINCT boss_name), MIN(fetched_at)
+                FROM responses
+                GROUP BY run_id
+                ORDER BY MIN(fetched_at)
+            """)
+            return cursor.fetchall()
+
+    def latest_run_id(self):
+        """Return the id of the most recent recorded run, or None"""
+        runs = self.list_runs()
+        return runs[-1][0] if runs else None
+
+    def iter_run(self, run_id):
+        """Yield (boss_name, page, fetched_at, body) in boss/page/fetch order"""
+        with self.lock:
+            rows = self._connect().execute("""
+                SELECT boss_name, page, fetched_at, body
+                FROM responses
+                WHERE run_id = ?
+                ORDER BY boss_name, page, fetched_at
+            """, (run_id,)).fetchall()
+        for boss_name, page, fetched_at, body in rows:
+            yield boss_name, page, fetched_at, zlib.decompress(body).decode('utf-8')
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+# Create global instance
+try:
+    from config import ARCHIVE_FILE
+    global_response_archive = ResponseArchive(ARCHIVE_FILE)
+except Exception as e:
+    logger.error(f"❌ Failed to create response archive: {e}")
+    global_response_archive = None
\ No newline at end of file
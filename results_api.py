@@ -0,0 +1,108 @@
+# results_api.py
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+from structured_log import get_logger
+
+logger = get_logger("results_api")
+
+class ResultsRequestHandler(BaseHTTPRequestHandler):
+    """Read-only JSON endpoints over the results store.
+
+    GET /totals[?since=EPOCH]                 latest full total per boss, with deltas
+    GET /bosses/<name>/history[?since=EPOCH]  saved totals for one boss
+    GET /health                               store version and server time
+
+    Every response carries an ETag derived from the store version and the
+    request, so a poller sending If-None-Match gets 304 until new results land.
+    """
+    store = None
+    server_version = "OSRSResultsAPI/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        
+        try:
+            since = float(query['since'][0]) if 'since' in query else None
+        except ValueError:
+            return self._send_json(400, {'error': "'since' must be epoch seconds"})
+        
+        version = self.store.get_version()
+        request_hash = zlib.crc32(self.path.encode('utf-8'))
+        etag = f'W/"{version}-{request_hash:08x}"'
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            return self._send_not_modified(etag)
+        
+        if parts == ['totals']:
+            payload = {'bosses': self.store.latest_totals(since)}
+        elif len(parts) == 3 and parts[0] == 'bosses' and parts[2] == 'history':
+            payload = {'boss_name': parts[1], 'history': self.store.boss_history(parts[1], since)}
+        elif parts == ['health']:
+            payload = {}
+        else:
+            return self._send_json(404, {'error': 'not found'})
+        
+        payload['version'] = version
+        payload['server_time'] = time.time()
+        self._send_json(200, payload, etag)
+
+    def _send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.end_headers()
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"🌐 {self.address_string()} {format % args}")
+
+class ResultsServer:
+    """Local HTTP server for the results API, run in a background thread or blocking"""
+
+    def __init__(self, store, host="127.0.0.1", port=8765):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def _create(self):
+        handler = type('BoundResultsRequestHandler', (ResultsRequestHandler,), {'store': self.store})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        logger.info(f"🌐 Results API on http://{self.host}:{self.port}/totals")
+
+    def start(self):
+        """Serve in a background thread alongside scraping runs"""
+        self._create()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="results-api", daemon=True)
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on this thread until interrupted"""
+        self._create()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
\ No newline at end of file
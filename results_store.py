@@ -0,0 +1,171 @@
+# results_store.py
+import glob
+import os
+import sqlite3
+import pandas as pd
+from datetime import datetime
+from threading import Lock
+from structured_log import get_logger
+
+logger = get_logger("results_store")
+
+class ResultsStore:
+    """History of every saved boss total, the data source for the results API.
+
+    Rows are append-only, so the highest row id doubles as a version number:
+    it changes exactly when new results land, which makes it a cheap ETag.
+    """
+
+    def __init__(self, db_file, csv_folder=None):
+        self.db_file = db_file
+        self.csv_folder = csv_folder
+        self.conn = None
+        self.version = 0
+        self.lock = Lock()
+
+    def _connect(self):
+        if self.conn is None:
+            folder = os.path.dirname(self.db_file)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS boss_totals (
+                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                    boss_name  TEXT    NOT NULL,
+                    total_kc   INTEGER NOT NULL,
+                    players    INTEGER NOT NULL,
+                    updated_at REAL    NOT NULL,
+                    partial    INTEGER NOT NULL DEFAULT 0,
+                    estimated  INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_boss_totals_boss
+                ON boss_totals (boss_name, id)
+            """)
+            self.conn.commit()
+            self.version = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM boss_totals").fetchone()[0]
+            if self.version == 0 and self.csv_folder:
+                self._import_csv_totals()
+        return self.conn
+
+    def open(self):
+        """Open the store now; an empty store is seeded from the CSVs on disk"""
+        with self.lock:
+            self._connect()
+
+    def _import_csv_totals(self):
+        """Seed an empty store from the per-boss CSVs already in the output folder"""
+        imported = 0
+        for csv_path in sorted(glob.glob(os.path.join(self.csv_folder, "*.csv"))):
+            try:
+                row = pd.read_csv(csv_path).iloc[0]
+                updated_at = datetime.strptime(str(row['Last Updated']), "%Y-%m-%d %H:%M:%S").timestamp()
+                self._insert(str(row['Boss Name']), int(row['Total KC']), int(row['Players']), updated_at,
+                             bool(row.get('Partial', False)), bool(row.get('Estimated', False)))
+                imported += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Skipping {os.path.basename(csv_path)} when seeding results store: {e}")
+        self.conn.commit()
+        if imported:
+            logger.info(f"🗄️ Results store seeded from {imported} CSV files")
+
+    def _insert(self, boss_name, total_kc, players, updated_at, partial, estimated):
+        cursor = self.conn.execute(
+            "INSERT INTO boss_totals (boss_name, total_kc, players, updated_at, partial, estimated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (boss_name, total_kc, players, updated_at, int(partial), int(estimated))
+        )
+        self.version = cursor.lastrowid
+
+    def record(self, boss_name, total_kc, players, updated_at, partial=False, estimated=False):
+        """Append one saved boss total"""
+        with self.lock:
+            self._connect()
+            self._insert(boss_name, int(total_kc), int(players), updated_at, partial, estimated)
+            self.conn.commit()
+
+    def get_version(self):
+        with self.lock:
+            self._connect()
+            return self.version
+
+    def latest_totals(self, since=None):
+        """Latest full total per boss with deltas against the previous full one.
+
+        Partial and estimated rows never replace or diff against a full total;
+        a newer one is reported under 'latest_partial' instead. A boss with no
+        full total yet reports its newest row. With `since` (epoch seconds)
+        only bosses updated after it are returned."""
+        with self.lock:
+            rows = self._connect().execute("""
+                SELECT ids.boss_name, m.total_kc, m.players, m.updated_at, m.partial, m.estimated,
+                       p.total_kc, p.players,
+                       l.total_kc, l.players, l.updated_at, l.partial, l.estimated
+                FROM (
+                    SELECT boss_name, MAX(id) AS newest_id,
+                           MAX(CASE WHEN partial = 0 AND estimated = 0 THEN id END) AS full_id
+                    FROM boss_totals GROUP BY boss_name
+                ) ids
+                JOIN boss_totals m ON m.id = COALESCE(ids.full_id, ids.newest_id)
+                LEFT JOIN boss_totals p ON p.id = (
+                    SELECT MAX(id) FROM boss_totals
+                    WHERE boss_name = ids.boss_name AND partial = 0 AND estimated = 0 AND id < ids.full_id)
+                LEFT JOIN boss_totals l ON l.id = ids.newest_id AND ids.newest_id != m.id
+                WHERE MAX(m.updated_at, COALESCE(l.updated_at, 0)) > ?
+                ORDER BY m.total_kc DESC
+            """, (since or 0,)).fetchall()
+        totals = []
+        for (boss_name, total_kc, players, updated_at, partial, estimated, previous_kc, previous_players,
+             newer_kc, newer_players, newer_updated_at, newer_partial, newer_estimated) in rows:
+            totals.append({
+                'boss_name': boss_name,
+                'total_kc': total_kc,
+                'players': players,
+                'updated_at': updated_at,
+                'partial': bool(partial),
+                'estimated': bool(estimated),
+                'kc_delta': None if previous_kc is None else total_kc - previous_kc,
+                'players_delta': None if previous_players is None else players - previous_players,
+                'latest_partial': None if newer_kc is None else {
+                    'total_kc': newer_kc,
+                    'players': newer_players,
+                    'updated_at': newer_updated_at,
+                    'partial': bool(newer_partial),
+                    'estimated': bool(newer_estimated),
+                },
+            })
+        return totals
+
+    def boss_history(self, boss_name, since=None, limit=500):
+        """Saved totals for one boss, oldest first"""
+        with self.lock:
+            rows = self._connect().execute("""
+                SELECT total_kc, players, updated_at, partial, estimated FROM (
+                    SELECT id, total_kc, players, updated_at, partial, estimated FROM boss_totals
+                    WHERE boss_name = ? AND updated_at > ?
+                    ORDER BY id DESC LIMIT ?
+                ) ORDER BY id
+            """, (boss_name, since or 0, limit)).fetchall()
+        return [{
+            'total_kc': total_kc,
+            'players': players,
+            'updated_at': updated_at,
+            'partial': bool(partial),
+            'estimated': bool(estimated),
+        } for total_kc, players, updated_at, partial, estimated in rows]
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+# Create global instance
+try:
+    from config import RESULTS_DB_FILE, OUTPUT_FOLDER
+    global_results_store = ResultsStore(RESULTS_DB_FILE, OUTPUT_FOLDER)
+except Exception as e:
+    logger.error(f"❌ Failed to create results store: {e}")
+    global_results_store = None
\ No newline at end of file
@@ -0,0 +1,82 @@
+# row_batch.py
+from array import array
+from threading import Lock
+
+class NameTable:
+    """Dictionary encoding for player names: each distinct name is stored once"""
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.lock = Lock()
+
+    def encode(self, name):
+        name_id = self.ids.get(name)
+        if name_id is None:
+            with self.lock:
+                name_id = self.ids.get(name)
+                if name_id is None:
+                    name_id = len(self.names)
+                    self.names.append(name)
+                    self.ids[name] = name_id
+        return name_id
+
+    def decode(self, name_id):
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+class RowBatch:
+    """Typed, array-backed HiScores rows: int64 ranks and scores plus encoded names.
+
+    Used for a single parsed page and for a boss's accumulated pages alike;
+    extend() appends another batch without creating per-row objects.
+    """
+    __slots__ = ('ranks', 'scores', 'name_ids')
+
+    def __init__(self):
+        self.ranks = array('q')
+        self.scores = array('q')
+        self.name_ids = array('l')
+
+    @classmethod
+    def from_columns(cls, ranks, names, scores):
+        """Build a batch from parallel rank/name/score columns"""
+        batch = cls()
+        batch.ranks.extend(ranks)
+        batch.name_ids.extend(global_name_table.encode(name) for name in names)
+        batch.scores.extend(scores)
+        return batch
+
+    def append(self, rank, name, score):
+        self.ranks.append(rank)
+        self.name_ids.append(global_name_table.encode(name))
+        self.scores.append(score)
+
+    def extend(self, other):
+        self.ranks.extend(other.ranks)
+        self.name_ids.extend(other.name_ids)
+        self.scores.extend(other.scores)
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def total_score(self):
+        return sum(self.scores)
+
+    def names(self):
+        """Decoded player names in row order"""
+        return [global_name_table.decode(name_id) for name_id in self.name_ids]
+
+    def rows(self):
+        """Yield (rank, name, score) tuples, e.g. for debugging or export"""
+        for rank, name_id, score in zip(self.ranks, self.name_ids, self.scores):
+            yield rank, global_name_table.decode(name_id), score
+
+def parse_number(text):
+    """'1,234' -> 1234"""
+    return int(text.replace(',', ''))
+
+# Create global instance
+global_name_table = NameTable()
\ No newline at end of file
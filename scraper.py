@@ -1,11 +1,20 @@
 # scraper.py
+import logging
 import requests
 import time
-from bs4 import BeautifulSoup
-from config import TIMEOUT, RETRY_ATTEMPTS, MIN_DELAY, MAX_DELAY, ENABLE_SESSION_REUSE, SESSION_TIMEOUT, USE_CONNECTION_POOL
+from config import TIMEOUT, RETRY_ATTEMPTS, MIN_DELAY, MAX_DELAY, ENABLE_SESSION_REUSE, SESSION_TIMEOUT, USE_CONNECTION_POOL, ARCHIVE_MODE
 import random
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from structured_log import get_logger
+
+logger = get_logger("scraper")
+
+from response_archive import global_response_archive as response_archive
+from profiler import profiled
+from row_batch import RowBatch
+from page_parser import parse_page_columns
+from parse_pool import global_parse_pool as parse_pool
 
 # Session management
 worker_sessions = {}
@@ -17,7 +26,7 @@ try:
     from header_rotator import global_header_rotator as header_rotator
 except Exception as e:
     # COMPLETE THE EXCEPT BLOCK PROPERLY
-    print(f"❌ Failed to import header rotator: {e}")
+    logger.error(f"❌ Failed to import header rotator: {e}")
     
     # Create a simple fallback
     class FallbackHeaderRotator:
@@ -45,7 +54,7 @@ except Exception as e:
             return 1
     
     header_rotator = FallbackHeaderRotator()
-    print(f"🔄 Using fallback header rotator")
+    logger.warning(f"🔄 Using fallback header rotator")
 
 def get_session_for_worker(worker_id):
     """Get or create a session for a worker with optimized settings"""
@@ -86,13 +95,52 @@ def get_session_for_worker(worker_id):
         
         worker_sessions[worker_id] = session
         session_creation_time[worker_id] = current_time
-        # print(f"🔄 Worker {worker_id}: Created new session")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔄 Worker {worker_id}: Created new session", extra={'worker': worker_id})
     
     last_request_time[worker_id] = current_time
     return worker_sessions[worker_id]
+
+@profiled
+def parse_page(html):
+    """Extract rows from a HiScores page into a typed RowBatch.
+
+    Parsing runs in the parse worker pool when PARSE_WORKERS > 0, otherwise
+    on the calling thread. Returns None when the page has no table (usually
+    a block page)."""
+    if parse_pool.enabled:
+        columns = parse_pool.parse_columns(html)
+    else:
+        columns = parse_page_columns(html)
+    if columns is None:
+        return None
+    return RowBatch.from_columns(*columns)
+    
+def wait_or_stop(seconds, should_stop=None):
+    """Sleep for `seconds`, waking early if should_stop() turns true. Returns False if stopped"""
+    if should_stop is None:
+        time.sleep(seconds)
+        return True
+    end_time = time.time() + seconds
+    while not should_stop():
+        remaining = end_time - time.time()
+        if remaining <= 0:
+            return True
+        time.sleep(min(remaining, 1.0))
+    return False
+
+@profiled
+def scrape_page(boss_name, url, page, worker_id=0, should_stop=None, allow_empty=False):
+    """Scrape one page with rotating headers per worker.
+
+    should_stop is an optional callable polled during retry waits; when it
+    returns True the page is abandoned and [] is returned. allow_empty=True
+    returns a table with no player rows (past the end of the HiScores)
+    instead of retrying it."""
+    log_ctx = {'worker': worker_id, 'boss': boss_name, 'page': page}
+    # Checked once per page so the per-request debug lines cost nothing at INFO
+    debug = logger.isEnabledFor(logging.DEBUG)
     
-def scrape_page(boss_name, url, page, worker_id=0):
-    """Scrape one page with rotating headers per worker"""
     # Build URL
     try:
         if 'page=' in url:
@@ -100,14 +148,14 @@ def scrape_page(boss_name, url, page, worker_id=0):
         else:
             page_url = f"{url}&page={page}" if '?' in url else f"{url}?page={page}"
     except Exception as e:
-        print(f"❌ Error building URL: {e}")
+        logger.error(f"❌ Error building URL: {e}", extra=log_ctx)
         return []
     
     # Get headers for this worker
     try:
         headers = header_rotator.get_headers_for_worker(worker_id)
     except Exception as e:
-        print(f"❌ Error getting headers: {e}")
+        logger.error(f"❌ Error getting headers: {e}", extra=log_ctx)
         return []
     
     # Add cache-busting parameter
@@ -129,10 +177,10 @@ def scrape_page(boss_name, url, page, worker_id=0):
             
             # Random delay
             delay = random.uniform(MIN_DELAY, MAX_DELAY)
-            #print(f"⏱️ Worker {worker_id} waiting {delay:.1f}s before request...")
             time.sleep(delay)
             
-            #print(f"🌐 Worker {worker_id} making request (attempt {retry_count + 1})...")
+            if debug:
+                logger.debug(f"🌐 Worker {worker_id} making request (attempt {retry_count + 1})...", extra=log_ctx)
             
             # OPTIMIZATION: Use session instead of direct requests.get
             session = get_session_for_worker(worker_id)
@@ -144,80 +192,87 @@ def scrape_page(boss_name, url, page, worker_id=0):
                 verify=True
             )
             
-            #print(f"📡 Worker {worker_id} got status code: {response.status_code}")
+            if debug:
+                logger.debug(f"📡 Worker {worker_id} got status code: {response.status_code}",
+                             extra={**log_ctx, 'status_code': response.status_code})
             
             # Handle rate limiting
             if response.status_code == 429:
                 retry_after = int(response.headers.get('Retry-After', 60))
-                print(f"⏸️ Worker {worker_id} rate limited. Waiting {retry_after}s...")
-                time.sleep(retry_after)
+                logger.warning(f"⏸️ Worker {worker_id} rate limited. Waiting {retry_after}s...",
+                               extra={**log_ctx, 'status_code': 429, 'wait': retry_after})
+                if not wait_or_stop(retry_after, should_stop):
+                    return []
                 headers = header_rotator.rotate_worker_headers(worker_id)
                 retry_count += 1
                 continue
                 
             # Handle IP block
             if response.status_code in [403, 503]:
-                print(f"🚫 Worker {worker_id} IP blocked. Waiting 5 minutes...")
-                time.sleep(300)
+                logger.warning(f"🚫 Worker {worker_id} IP blocked. Waiting 5 minutes...",
+                               extra={**log_ctx, 'status_code': response.status_code, 'wait': 300})
+                if not wait_or_stop(300, should_stop):
+                    return []
                 headers = header_rotator.rotate_worker_headers(worker_id)
                 retry_count += 1
                 continue
                 
             response.raise_for_status()
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Keep the raw body so the run can be replayed offline
+            if ARCHIVE_MODE == "record" and response_archive is not None:
+                try:
+                    response_archive.record(boss_name, page, page_url, response.status_code, response.text)
+                except Exception as e:
+                    logger.warning(f"⚠️ Worker {worker_id}: Failed to archive response: {e}", extra=log_ctx)
             
-            # Find the main table
-            table = soup.find('table')
-            if not table:
-                print(f"⚠️ Worker {worker_id}: No table found in HTML. IP address possibly blocked.")
-                time.sleep(60)
+            # Parse HTML
+            rows = parse_page(response.text)
+            if rows is None:
+                logger.warning(f"⚠️ Worker {worker_id}: No table found in HTML. IP address possibly blocked.", extra=log_ctx)
+                if not wait_or_stop(60, should_stop):
+                    return []
                 retry_count += 1
                 continue
             
-            # Extract rows
-            rows = []
-            for tr in table.find_all('tr')[1:]:  # Skip header row
-                cells = tr.find_all('td')
-                if len(cells) >= 3:
-                    rank = cells[0].get_text(strip=True)
-                    name = cells[1].get_text(strip=True)
-                    score = cells[2].get_text(strip=True)
-                    rows.append([rank, name, score])
-            
-            if rows:
-                #print(f"✅ Worker {worker_id}: Successfully extracted {len(rows)} players")
+            if rows or allow_empty:
+                if debug:
+                    logger.debug(f"✅ Worker {worker_id}: Successfully extracted {len(rows)} players",
+                                 extra={**log_ctx, 'players': len(rows)})
                 return rows
             else:
-                print(f"⚠️ Worker {worker_id}: No player data found in table")
-                time.sleep(30)
+                logger.warning(f"⚠️ Worker {worker_id}: No player data found in table", extra=log_ctx)
+                if not wait_or_stop(30, should_stop):
+                    return []
                 retry_count += 1
                 continue
                 
         except requests.exceptions.Timeout:
-            print(f"⏱️ Worker {worker_id}: Timeout")
-            print(f"⏸️ Waiting {base_delay}s...")
-            time.sleep(base_delay)
+            logger.warning(f"⏱️ Worker {worker_id}: Timeout. Waiting {base_delay}s...",
+                           extra={**log_ctx, 'wait': base_delay})
+            if not wait_or_stop(base_delay, should_stop):
+                return []
             retry_count += 1
             base_delay = min(base_delay * 1.5, 300)
             
         except requests.exceptions.RequestException as e:
-            print(f"❌ Worker {worker_id}: Request error: {type(e).__name__}")
-            print(f"⏸️ Waiting {base_delay}s...")
-            time.sleep(base_delay)
+            logger.warning(f"❌ Worker {worker_id}: Request error: {type(e).__name__}. Waiting {base_delay}s...",
+                           extra={**log_ctx, 'error': type(e).__name__, 'wait': base_delay})
+            if not wait_or_stop(base_delay, should_stop):
+                return []
             retry_count += 1
             base_delay = min(base_delay * 1.5, 300)
             headers = header_rotator.rotate_worker_headers(worker_id)
             
         except Exception as e:
-            print(f"❌ Worker {worker_id}: Unexpected error: {type(e).__name__}")
-            print(f"⏸️ Waiting {base_delay}s...")
-            time.sleep(base_delay)
+            logger.error(f"❌ Worker {worker_id}: Unexpected error: {type(e).__name__}. Waiting {base_delay}s...",
+                         extra={**log_ctx, 'error': type(e).__name__, 'wait': base_delay})
+            if not wait_or_stop(base_delay, should_stop):
+                return []
             retry_count += 1
             base_delay = min(base_delay * 1.5, 300)
             
         # Safety check
         if retry_count >= max_retries:
-            print(f"🚨 Worker {worker_id}: Max retries reached")
+            logger.error(f"🚨 Worker {worker_id}: Max retries reached", extra=log_ctx)
             return []
\ No newline at end of file
@@ -0,0 +1,177 @@
+# structured_log.py
+import atexit
+import json
+import logging
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = "osrs"
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Console writes (log lines and the status bar) share one lock so a log line
+# never lands in the middle of a status redraw
+console_lock = threading.Lock()
+last_status_line = ""
+
+log_queue = None
+log_listener = None
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record, including structured extra fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class ConsoleHandler(logging.Handler):
+    """Writes log lines above the status bar and redraws the bar after them"""
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.redraw = self.stream.isatty()
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            with console_lock:
+                if self.redraw:
+                    self.stream.write('\r\033[K' + message + '\n' + last_status_line)
+                else:
+                    self.stream.write(message + '\n')
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+def write_status(status_line):
+    """Replace the status bar on the console (no-op when stdout is not a terminal)"""
+    global last_status_line
+    if not sys.stdout.isatty():
+        return
+    with console_lock:
+        last_status_line = status_line
+        sys.stdout.write('\r\033[K' + status_line)
+        sys.stdout.flush()
+
+def clear_status():
+    """Remove the status bar so plain output can follow"""
+    global last_status_line
+    with console_lock:
+        last_status_line = ""
+        if sys.stdout.isatty():
+            sys.stdout.write('\r\033[K')
+            sys.stdout.flush()
+
+class StatusDisplay:
+    """Renders progress from tracker snapshots on its own thread.
+
+    On a terminal the status bar is redrawn every `interval` seconds; when
+    output is redirected a plain progress log line is written every
+    `log_interval` seconds instead.
+    """
+
+    def __init__(self, tracker, render, interval=0.5, log_interval=30):
+        self.tracker = tracker
+        self.render = render
+        self.interval = interval
+        self.log_interval = log_interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="status-display", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+        clear_status()
+
+    def _run(self):
+        logger = get_logger("status")
+        last_log = time.time()
+        while not self.stop_event.wait(self.interval):
+            progress = self.tracker.get_progress()
+            if sys.stdout.isatty():
+                write_status(self.render(progress))
+            elif time.time() - last_log >= self.log_interval:
+                last_log = time.time()
+                logger.info(f"📊 Progress: {progress['completed_bosses']}/{progress['total_bosses']} bosses, "
+                            f"{progress['completed_pages']}/{progress['total_pages']} pages, ETA {progress['eta']}",
+                            extra={'completed_bosses': progress['completed_bosses'],
+                                   'completed_pages': progress['completed_pages']})
+
+def setup_logging(level="INFO", console_level="INFO", json_file=None):
+    """Attach a queue-backed background writer to the "osrs" logger (idempotent)"""
+    global log_queue, log_listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if log_listener is not None:
+        return logger
+    
+    if multiprocessing.current_process().name != 'MainProcess':
+        # Worker processes (e.g. parse workers re-importing main) stay quiet and keep off the log file
+        logger.setLevel(logging.WARNING)
+        return logger
+    
+    console = ConsoleHandler()
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers = [console]
+    
+    if json_file:
+        json_handler = logging.FileHandler(json_file, encoding='utf-8')
+        json_handler.setFormatter(JsonLineFormatter())
+        handlers.append(json_handler)
+    
+    log_queue = queue.Queue()
+    log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(shutdown_logging)
+    
+    logger.setLevel(level)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    return logger
+
+def flush_logs():
+    """Block until every queued record has been written"""
+    if log_queue is not None:
+        log_queue.join()
+
+def shutdown_logging():
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+def get_logger(name):
+    """Child logger of "osrs", e.g. get_logger("scraper")"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+# Configure once at import, like the other global instances
+try:
+    from config import LOG_LEVEL, LOG_CONSOLE_LEVEL, LOG_JSON_FILE
+    setup_logging(LOG_LEVEL, LOG_CONSOLE_LEVEL, LOG_JSON_FILE)
+except Exception as e:
+    print(f"❌ Failed to configure logging: {e}")
+    setup_logging()
\ No newline at end of file